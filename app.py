@@ -1,12 +1,24 @@
 """NVIDIA RAG Q&A Chat Application - Streamlit Entry Point."""
 
 import os
-import atexit
 import streamlit as st
 from dotenv import load_dotenv
 
+@st.cache_resource(show_spinner=False)
+def _load_env() -> bool:
+    """Load environment variables from .env once per server process."""
+    return load_dotenv()
+
+
+@st.cache_resource(show_spinner=False)
+def _configure_llm() -> bool:
+    """Configure the LlamaIndex LLM and embedding settings once per server process."""
+    configure_llm_settings()
+    return True
+
+
 # Load environment variables
-load_dotenv()
+_load_env()
 
 # Configure page
 st.set_page_config(
@@ -16,48 +28,24 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize session state variables if not present
-if 'chat_history' not in st.session_state:
-    st.session_state.chat_history = []
-
-if 'documents_loaded' not in st.session_state:
-    st.session_state.documents_loaded = False
-
-if 'vector_store' not in st.session_state:
-    st.session_state.vector_store = None
-
-if 'query_engine' not in st.session_state:
-    st.session_state.query_engine = None
-
-if 'partial_response' not in st.session_state:
-    st.session_state.partial_response = ""
-
-if 'response_completed' not in st.session_state:
-    st.session_state.response_completed = True
-    
-if 'authenticated' not in st.session_state:
-    st.session_state.authenticated = False
+# Default session state values, applied on the first run of each browser session
+_SS_DEFAULTS = {
+    "chat_history": [],
+    "documents_loaded": False,
+    "query_engine": None,
+    "authenticated": False,
+    "current_user": None,
+    "session_id": None,
+    "session_expiry": None,
+    "login_attempts": 0,
+    "lockout_until_ts": 0.0,
+    "admin_mode": False,
+    "admin_view": False,
+}
 
-if 'current_user' not in st.session_state:
-    st.session_state.current_user = None
-    
-if 'session_id' not in st.session_state:
-    st.session_state.session_id = None
-    
-if 'session_expiry' not in st.session_state:
-    st.session_state.session_expiry = None
-    
-if 'login_attempts' not in st.session_state:
-    st.session_state.login_attempts = 0
-    
-if 'lockout_until' not in st.session_state:
-    st.session_state.lockout_until = None
-    
-if 'admin_mode' not in st.session_state:
-    st.session_state.admin_mode = False
-    
-if 'admin_view' not in st.session_state:
-    st.session_state.admin_view = False
+for key, value in _SS_DEFAULTS.items():
+    if key not in st.session_state:
+        st.session_state[key] = value
 
 # Import application modules
 from src.utils.config import Config
@@ -67,17 +55,17 @@ from src.ui.admin_panel import admin_ui
 from src.ui.chat import chat_ui
 from src.auth.auth_manager import initialize_admin_account, validate_session
 from src.llm.nvidia_llm import configure_llm_settings
-from src.database import get_database, close_database
+from src.database import get_database
 
 
 def main():
     """Main entry point for the application."""
+    # Sessions are validated at most once per script run
+    st.session_state._session_validated = None
+    
     # Get database interface
     db = get_database()
     
-    # Register cleanup function
-    atexit.register(close_database)
-    
     # Validate configuration
     error = Config.validate()
     if error:
@@ -86,7 +74,7 @@ def main():
     
     # Configure LLM settings
     try:
-        configure_llm_settings()
+        _configure_llm()
     except Exception as e:
         st.error(f"Error configuring LLM settings: {str(e)}")
         st.stop()
@@ -10,6 +10,7 @@ from src.utils.config import Config
 from src.utils.logger import log_activity
 from src.auth.user import UserManager, User
 from src.auth.session import SessionManager, Session
+from src.database import get_database
 from src.database.base import DatabaseInterface
 
 
@@ -41,6 +42,11 @@ class AuthManager:
         if not user or not user.verify_password(password):
             return False
         
+        # Upgrade unsalted SHA-256 and outdated Argon2 hashes while the
+        # password is at hand
+        if user.needs_rehash():
+            self.user_manager.update_user_password(username, password)
+        
         # Update last login time
         self.user_manager.update_user_login(username)
         
@@ -66,7 +72,15 @@ class AuthManager:
         if not st.session_state.get("authenticated", False) or not st.session_state.get("session_id"):
             return False
         
-        return self.session_manager.validate_session(st.session_state.session_id)
+        # Already validated during this script run (reset by main())
+        if st.session_state.get("_session_validated") == st.session_state.session_id:
+            return True
+        
+        if not self.session_manager.validate_session(st.session_state.session_id):
+            return False
+        
+        st.session_state._session_validated = st.session_state.session_id
+        return True
     
     def logout_user(self) -> None:
         """Log out the current user."""
@@ -82,23 +96,50 @@ class AuthManager:
         st.session_state.current_user = None
         st.session_state.session_id = None
         st.session_state.session_expiry = None
+        st.session_state._session_validated = None
         st.session_state.admin_mode = False
 
 
+@st.cache_resource(show_spinner=False)
+def _build_auth_manager(db_type: str) -> AuthManager:
+    """Build the authentication manager once per server process.
+    
+    Args:
+        db_type: Configured database backend; keys the cached manager.
+        
+    Returns:
+        AuthManager: Authentication manager using the configured database.
+    """
+    return AuthManager(get_database())
+
+
 # Initialize the authentication manager as a singleton
 def get_auth_manager(db: Optional[DatabaseInterface] = None) -> AuthManager:
     """Get the authentication manager singleton.
     
+    The manager holds no per-session state, so one instance is shared by
+    all browser sessions. Each session also keeps it in session state, so
+    later renders skip the database and resource cache lookups.
+    
     Args:
-        db: Database interface for persistence.
+        db: Database interface for persistence. Defaults to the configured
+            database; an explicit database gets its own, uncached manager.
         
     Returns:
         AuthManager: Authentication manager instance.
     """
-    if "auth_manager" not in st.session_state:
-        st.session_state.auth_manager = AuthManager(db)
+    if db is not None:
+        return AuthManager(db)
     
-    return st.session_state.auth_manager
+    auth_manager = st.session_state.get("_auth_manager")
+    if auth_manager is None:
+        auth_manager = _build_auth_manager(Config.DB_TYPE.lower())
+        if auth_manager.db is None:
+            # Don't keep a manager without a database, so a later connection is used
+            _build_auth_manager.clear()
+        else:
+            st.session_state._auth_manager = auth_manager
+    return auth_manager
 
 
 def initialize_admin_account() -> None:
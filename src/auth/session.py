@@ -1,7 +1,6 @@
 """Session management for authentication."""
 
-import os
-import yaml
+import time
 import uuid
 from datetime import datetime, timedelta
 from typing import Dict, Any, Optional
@@ -9,13 +8,30 @@ from typing import Dict, Any, Optional
 import streamlit as st
 
 from src.utils.config import Config
+from src.utils.file_cache import load_json, save_json
 from src.utils.logger import log_activity
 from src.database.base import DatabaseInterface
 
 
+def _is_expired(expires_at: Any, now: float) -> bool:
+    """Check a stored session expiry against the current time.
+    
+    Args:
+        expires_at: Stored expiry in seconds since the epoch.
+        now: Current time in seconds since the epoch.
+        
+    Returns:
+        bool: True if expired. Entries written before expiries were stored as
+        epoch seconds are treated as expired.
+    """
+    return not isinstance(expires_at, (int, float)) or now > expires_at
+
+
 class Session:
     """Session model class."""
     
+    __slots__ = ("session_id", "username", "created_at", "expires_at")
+    
     def __init__(self, session_id: str, username: str, created_at: datetime, expires_at: datetime):
         """Initialize a session.
         
@@ -60,7 +76,7 @@ class SessionManager:
             db: Database interface for persistence.
         """
         self.db = db
-        self._config_path = Config.USER_CONFIG_PATH
+        self._sessions_path = Config.SESSIONS_JSON_PATH
     
     def create_session(self, username: str) -> Optional[Session]:
         """Create a new session for a user.
@@ -82,18 +98,15 @@ class SessionManager:
                 return None
         else:
             # Fall back to file-based storage
-            config = self._load_config()
+            sessions = self._load_sessions()
             
-            if "active_sessions" not in config:
-                config["active_sessions"] = {}
-            
-            config["active_sessions"][session_id] = {
+            sessions[session_id] = {
                 "username": username,
                 "created_at": created_at.isoformat(),
-                "expires_at": expires_at.isoformat()
+                "expires_at": int(expires_at.timestamp())
             }
             
-            self._save_config(config)
+            self._save_sessions(sessions)
         
         # Create session
         session = Session(
@@ -123,48 +136,64 @@ class SessionManager:
         if not session_id:
             return False
         
+        # Read the clock once and reuse it for every comparison below
+        now = datetime.now()
+        expiry_window = timedelta(minutes=Config.SESSION_EXPIRY_MINUTES)
+        
         # Check current session state first
         if hasattr(st.session_state, 'session_id') and st.session_state.session_id == session_id:
             if hasattr(st.session_state, 'session_expiry'):
-                if datetime.now() > st.session_state.session_expiry:
+                if now > st.session_state.session_expiry:
                     self.delete_session(session_id)
                     return False
                 
+                # Only renew once less than half of the expiry window remains,
+                # so most reruns return without touching storage
+                if st.session_state.session_expiry - now > expiry_window / 2:
+                    return True
+                
                 # Extend session
-                new_expiry = datetime.now() + timedelta(minutes=Config.SESSION_EXPIRY_MINUTES)
+                new_expiry = now + expiry_window
                 st.session_state.session_expiry = new_expiry
                 
-                # Update in database if available
+                # Update in database if available. File-based storage is not
+                # rewritten here: the expiry already lives in session state.
                 if self.db:
-                    self.db.store_session(session_id, st.session_state.current_user, new_expiry)
-                else:
-                    # Fall back to file-based storage
-                    config = self._load_config()
-                    if "active_sessions" in config and session_id in config["active_sessions"]:
-                        config["active_sessions"][session_id]["expires_at"] = new_expiry.isoformat()
-                        self._save_config(config)
+                    self.db.update_session_expiry(session_id, new_expiry)
                 
                 return True
         
         # If not in session state or missing expiry, check database or file
+        now_ts = now.timestamp()
+        new_expiry = now + expiry_window
         if self.db:
-            # TODO: Implement database session validation
-            pass
+            session_data = self.db.get_session(session_id)
+            if session_data:
+                if now_ts > session_data["expires_at"]:
+                    self.delete_session(session_id)
+                    return False
+                
+                # Extend session
+                if not self.db.update_session_expiry(session_id, new_expiry):
+                    return False
+                
+                # Update session state
+                st.session_state.session_expiry = new_expiry
+                
+                return True
         else:
             # Fall back to file-based validation
-            config = self._load_config()
-            if "active_sessions" in config and session_id in config["active_sessions"]:
-                session_data = config["active_sessions"][session_id]
-                expires_at = datetime.fromisoformat(session_data["expires_at"])
+            sessions = self._load_sessions()
+            if session_id in sessions:
+                session_data = sessions[session_id]
                 
-                if datetime.now() > expires_at:
+                if _is_expired(session_data["expires_at"], now_ts):
                     self.delete_session(session_id)
                     return False
                 
                 # Extend session
-                new_expiry = datetime.now() + timedelta(minutes=Config.SESSION_EXPIRY_MINUTES)
-                config["active_sessions"][session_id]["expires_at"] = new_expiry.isoformat()
-                self._save_config(config)
+                session_data["expires_at"] = int(new_expiry.timestamp())
+                self._save_sessions(sessions)
                 
                 # Update session state
                 st.session_state.session_expiry = new_expiry
@@ -187,11 +216,11 @@ class SessionManager:
             return self.db.delete_session(session_id)
         
         # Fall back to file-based storage
-        config = self._load_config()
+        sessions = self._load_sessions()
         
-        if "active_sessions" in config and session_id in config["active_sessions"]:
-            del config["active_sessions"][session_id]
-            self._save_config(config)
+        if session_id in sessions:
+            del sessions[session_id]
+            self._save_sessions(sessions)
             return True
         
         return False
@@ -207,50 +236,45 @@ class SessionManager:
             return self.db.cleanup_expired_sessions()
         
         # Fall back to file-based storage
-        config = self._load_config()
-        
-        if "active_sessions" not in config:
-            return 0
+        sessions = self._load_sessions()
         
-        current_time = datetime.now()
+        current_time = time.time()
         expired_sessions = []
         
-        for session_id, session_data in config["active_sessions"].items():
-            expires_at = datetime.fromisoformat(session_data["expires_at"])
-            if current_time > expires_at:
+        for session_id, session_data in sessions.items():
+            if _is_expired(session_data["expires_at"], current_time):
                 expired_sessions.append(session_id)
         
         for session_id in expired_sessions:
-            del config["active_sessions"][session_id]
+            del sessions[session_id]
         
         if expired_sessions:
-            self._save_config(config)
+            self._save_sessions(sessions)
         
         return len(expired_sessions)
     
-    def _load_config(self) -> Dict[str, Any]:
-        """Load user configuration from YAML file.
+    def _load_sessions(self) -> Dict[str, Any]:
+        """Load active sessions from the JSON session store.
         
         Returns:
-            Dict[str, Any]: Configuration dictionary.
+            Dict[str, Any]: Dictionary mapping session IDs to session data.
         """
         try:
-            if os.path.exists(self._config_path):
-                with open(self._config_path, 'r') as file:
-                    return yaml.safe_load(file) or {}
-            return {"users": {}, "active_sessions": {}}
+            sessions = load_json(self._sessions_path)
+            if sessions is None:
+                return {}
+            return sessions
         except Exception as e:
-            st.error(f"Error loading user configuration: {str(e)}")
-            return {"users": {}, "active_sessions": {}}
+            st.error(f"Error loading sessions: {str(e)}")
+            return {}
     
-    def _save_config(self, config: Dict[str, Any]) -> None:
-        """Save user configuration to YAML file.
+    def _save_sessions(self, sessions: Dict[str, Any]) -> None:
+        """Save active sessions to the JSON session store.
         
         Args:
-            config: Configuration dictionary.
+            sessions: Dictionary mapping session IDs to session data.
         """
         try:
-            with open(self._config_path, 'w') as file:
-                yaml.dump(config, file)
+            save_json(self._sessions_path, sessions)
         except Exception as e:
-            st.error(f"Error saving user configuration: {str(e)}")
+            st.error(f"Error saving sessions: {str(e)}")
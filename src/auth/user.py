@@ -1,15 +1,15 @@
 """User model and operations."""
 
-import yaml
-import os
+import time
 import uuid
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 import streamlit as st
 
 from src.utils.config import Config
-from src.utils.security import hash_password, verify_password
+from src.utils.file_cache import load_yaml, save_yaml
+from src.utils.security import hash_password, password_needs_rehash, verify_password
 from src.utils.logger import log_activity
 from src.database.base import DatabaseInterface
 
@@ -17,6 +17,8 @@ from src.database.base import DatabaseInterface
 class User:
     """User model class."""
     
+    __slots__ = ("username", "password_hash", "is_admin", "created_at", "last_login")
+    
     def __init__(self, username: str, password_hash: str, is_admin: bool = False,
                  created_at: Optional[datetime] = None, last_login: Optional[datetime] = None):
         """Initialize a user.
@@ -44,28 +46,29 @@ class User:
         Returns:
             User: User object.
         """
-        created_at = None
-        if data.get('created_at'):
-            created_at = (
-                datetime.fromisoformat(data['created_at'])
-                if isinstance(data['created_at'], str)
-                else data['created_at']
-            )
-        
-        last_login = None
-        if data.get('last_login'):
-            last_login = (
-                datetime.fromisoformat(data['last_login'])
-                if isinstance(data['last_login'], str)
-                else data['last_login']
-            )
+        return cls._from_row(data['username'], data)
+    
+    @classmethod
+    def _from_row(cls, username: str, data: Dict[str, Any]) -> 'User':
+        """Create a user from a stored record keyed by username.
+        
+        Args:
+            username: Username of the user.
+            data: Dictionary containing the rest of the user data.
+            
+        Returns:
+            User: User object.
+        """
+        # Both stores write timestamps as ISO strings, so no type check is needed
+        created_at = data.get('created_at')
+        last_login = data.get('last_login')
         
         return cls(
-            username=data['username'],
+            username=username,
             password_hash=data['password_hash'],
             is_admin=data.get('is_admin', False),
-            created_at=created_at,
-            last_login=last_login
+            created_at=datetime.fromisoformat(created_at) if created_at else None,
+            last_login=datetime.fromisoformat(last_login) if last_login else None
         )
     
     def to_dict(self) -> Dict[str, Any]:
@@ -93,6 +96,14 @@ class User:
         """
         return verify_password(password, self.password_hash)
     
+    def needs_rehash(self) -> bool:
+        """Check whether the user's password hash is outdated.
+        
+        Returns:
+            bool: True if the hash is unsalted SHA-256 or uses old Argon2 parameters.
+        """
+        return password_needs_rehash(self.password_hash)
+    
     def update_last_login(self) -> None:
         """Update the user's last login timestamp."""
         self.last_login = datetime.now()
@@ -109,6 +120,8 @@ class UserManager:
         """
         self.db = db
         self._config_path = Config.USER_CONFIG_PATH
+        # Recently loaded users keyed by username, with the monotonic time they were loaded
+        self._user_cache: Dict[str, Tuple[float, User]] = {}
     
     def create_user(self, username: str, password: str, is_admin: bool = False) -> bool:
         """Create a new user.
@@ -121,6 +134,8 @@ class UserManager:
         Returns:
             bool: True if user was created, False if user already exists.
         """
+        self._user_cache.pop(username, None)
+        
         # Check if database interface is available
         if self.db:
             # Check if user already exists
@@ -154,6 +169,26 @@ class UserManager:
     def get_user(self, username: str) -> Optional[User]:
         """Get a user by username.
         
+        Users are cached for USER_CACHE_TTL_SECONDS after they are loaded.
+        
+        Args:
+            username: Username of the user.
+            
+        Returns:
+            Optional[User]: User object if found, None otherwise.
+        """
+        cached = self._user_cache.get(username)
+        if cached and time.monotonic() - cached[0] < Config.USER_CACHE_TTL_SECONDS:
+            return cached[1]
+        
+        user = self._load_user(username)
+        if user:
+            self._user_cache[username] = (time.monotonic(), user)
+        return user
+    
+    def _load_user(self, username: str) -> Optional[User]:
+        """Load a user from storage, bypassing the cache.
+        
         Args:
             username: Username of the user.
             
@@ -173,9 +208,7 @@ class UserManager:
         if username not in config.get("users", {}):
             return None
         
-        user_data = config["users"][username]
-        user_data['username'] = username  # Ensure username is in the data
-        return User.from_dict(user_data)
+        return User._from_row(username, config["users"][username])
     
     def update_user_login(self, username: str) -> bool:
         """Update the last login timestamp for a user.
@@ -186,6 +219,8 @@ class UserManager:
         Returns:
             bool: True if successful, False otherwise.
         """
+        self._user_cache.pop(username, None)
+        
         # Check if database interface is available
         if self.db:
             return self.db.update_user_login(username)
@@ -200,6 +235,33 @@ class UserManager:
         self._save_config(config)
         return True
     
+    def update_user_password(self, username: str, password: str) -> bool:
+        """Store a new hash of a user's password.
+        
+        Args:
+            username: Username of the user.
+            password: Plain text password of the user.
+            
+        Returns:
+            bool: True if successful, False otherwise.
+        """
+        self._user_cache.pop(username, None)
+        password_hash = hash_password(password)
+        
+        # Check if database interface is available
+        if self.db:
+            return self.db.update_user_password(username, password_hash)
+        
+        # Fall back to file-based storage
+        config = self._load_config()
+        
+        if username not in config.get("users", {}):
+            return False
+        
+        config["users"][username]["password_hash"] = password_hash
+        self._save_config(config)
+        return True
+    
     def delete_user(self, username: str) -> bool:
         """Delete a user.
         
@@ -209,6 +271,8 @@ class UserManager:
         Returns:
             bool: True if successful, False otherwise.
         """
+        self._user_cache.pop(username, None)
+        
         # Check if database interface is available
         if self.db:
             return self.db.delete_user(username)
@@ -231,17 +295,16 @@ class UserManager:
         """
         # Check if database interface is available
         if self.db:
-            users_data = self.db.get_all_users()
             return {
-                username: User.from_dict(user_data)
-                for username, user_data in users_data.items()
+                username: User._from_row(username, user_data)
+                for username, user_data in self.db.iter_all_users()
             }
         
         # Fall back to file-based storage
         config = self._load_config()
         
         return {
-            username: User.from_dict({**user_data, 'username': username})
+            username: User._from_row(username, user_data)
             for username, user_data in config.get("users", {}).items()
         }
     
@@ -252,13 +315,13 @@ class UserManager:
             Dict[str, Any]: Configuration dictionary.
         """
         try:
-            if os.path.exists(self._config_path):
-                with open(self._config_path, 'r') as file:
-                    return yaml.safe_load(file) or {}
-            return {"users": {}, "active_sessions": {}}
+            config = load_yaml(self._config_path)
+            if config is None:
+                return {"users": {}}
+            return config
         except Exception as e:
             st.error(f"Error loading user configuration: {str(e)}")
-            return {"users": {}, "active_sessions": {}}
+            return {"users": {}}
     
     def _save_config(self, config: Dict[str, Any]) -> None:
         """Save user configuration to YAML file.
@@ -267,7 +330,6 @@ class UserManager:
             config: Configuration dictionary.
         """
         try:
-            with open(self._config_path, 'w') as file:
-                yaml.dump(config, file)
+            save_yaml(self._config_path, config)
         except Exception as e:
             st.error(f"Error saving user configuration: {str(e)}")
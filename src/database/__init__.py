@@ -1,6 +1,9 @@
 """Database module for the application."""
 
-from typing import Optional
+import atexit
+import functools
+import importlib
+from typing import Any, Callable, Dict, Optional, Tuple, Type
 
 import streamlit as st
 
@@ -8,44 +11,83 @@ from src.utils.config import Config
 from src.utils.logger import logger
 from src.database.base import DatabaseInterface
 
+# Backend modules are imported on first use only, so pymongo is never loaded
+# for SQLite deployments. Maps DB_TYPE to (module, class, constructor args).
+_BACKENDS: Dict[str, Tuple[str, str, Callable[[], Tuple[Any, ...]]]] = {
+    "sqlite": ("src.database.sqlite", "SQLiteDatabase", lambda: (Config.SQLITE_DB_PATH,)),
+    "mongodb": ("src.database.mongodb", "MongoDBDatabase", lambda: (Config.MONGODB_URI, Config.MONGODB_DB)),
+}
 
-def get_database() -> Optional[DatabaseInterface]:
-    """Get the appropriate database interface based on configuration.
+
+@functools.lru_cache(maxsize=None)
+def _backend_class(db_type: str) -> Type[DatabaseInterface]:
+    """Import a database backend class once per process.
+    
+    Args:
+        db_type: Database backend to use.
+    
+    Returns:
+        Type[DatabaseInterface]: Database interface class.
+    """
+    module_name, class_name, _ = _BACKENDS[db_type]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+@st.cache_resource(show_spinner=False)
+def _create_database(db_type: str) -> Optional[DatabaseInterface]:
+    """Create and initialize the database interface once per server process.
+    
+    Reruns only hit the cached resource, so backend imports and setup run
+    once no matter how often app.py is rerun.
+    
+    Args:
+        db_type: Database backend to use.
     
     Returns:
         Optional[DatabaseInterface]: Database interface if available, None otherwise.
     """
-    # Check if database already exists in session state
-    if "database" in st.session_state and st.session_state.database:
-        return st.session_state.database
-    
-    db_type = Config.DB_TYPE.lower()
-    db: Optional[DatabaseInterface] = None
-    
-    if db_type == "sqlite":
-        from src.database.sqlite import SQLiteDatabase
-        db = SQLiteDatabase(Config.SQLITE_DB_PATH)
-    elif db_type == "mongodb":
-        from src.database.mongodb import MongoDBDatabase
-        db = MongoDBDatabase(Config.MONGODB_URI, Config.MONGODB_DB)
-    else:
+    if db_type not in _BACKENDS:
         logger.error(f"Unsupported database type: {db_type}")
         return None
     
+    try:
+        db = _backend_class(db_type)(*_BACKENDS[db_type][2]())
+    except ImportError as e:
+        logger.error(f"Error loading {db_type} database backend: {str(e)}")
+        return None
+    
     # Initialize database
     if db and db.initialize():
-        # Save to session state
-        st.session_state.database = db
         logger.info(f"Using {db_type} database")
+        # Registered with the cached resource rather than on every rerun;
+        # unregistering first keeps a single hook if the cache is rebuilt
+        atexit.unregister(close_database)
+        atexit.register(close_database)
         return db
     
     logger.error(f"Failed to initialize {db_type} database")
     return None
 
 
+def get_database() -> Optional[DatabaseInterface]:
+    """Get the appropriate database interface based on configuration.
+    
+    The interface is shared by all browser sessions of the server process.
+    
+    Returns:
+        Optional[DatabaseInterface]: Database interface if available, None otherwise.
+    """
+    db = _create_database(Config.DB_TYPE.lower())
+    if db is None:
+        # Don't cache failures so the next call retries the connection
+        _create_database.clear()
+    return db
+
+
 def close_database() -> None:
-    """Close the database connection."""
-    if "database" in st.session_state and st.session_state.database:
-        st.session_state.database.close()
-        del st.session_state.database
+    """Close the shared database connection."""
+    db = get_database()
+    if db:
+        db.close()
         logger.info("Closed database connection")
+    _create_database.clear()
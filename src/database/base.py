@@ -2,12 +2,15 @@
 
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
+from typing import ContextManager, Dict, Iterator, List, Optional, Any, Tuple
 
 
 class DatabaseInterface(ABC):
     """Abstract base class for database implementations."""
     
+    # No instance dict here, so implementations can be fully slotted
+    __slots__ = ()
+    
     @abstractmethod
     def initialize(self) -> bool:
         """Initialize the database connection and create necessary tables/collections.
@@ -22,6 +25,18 @@ class DatabaseInterface(ABC):
         """Close the database connection."""
         pass
     
+    @abstractmethod
+    def transaction(self) -> ContextManager[None]:
+        """Group the writes made inside a ``with`` block into one transaction.
+        
+        The transaction commits when the block exits normally and rolls back
+        if it raises.
+        
+        Returns:
+            ContextManager[None]: Context manager scoping the transaction.
+        """
+        pass
+    
     @abstractmethod
     def store_user(self, username: str, password_hash: str, is_admin: bool = False) -> bool:
         """Store user data in the database.
@@ -60,6 +75,19 @@ class DatabaseInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def update_user_password(self, username: str, password_hash: str) -> bool:
+        """Replace the password hash of a user.
+        
+        Args:
+            username: Username of the user.
+            password_hash: New hashed password of the user.
+            
+        Returns:
+            bool: True if the operation is successful, False otherwise.
+        """
+        pass
+    
     @abstractmethod
     def delete_user(self, username: str) -> bool:
         """Delete a user from the database.
@@ -86,6 +114,32 @@ class DatabaseInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve session data from the database.
+        
+        Args:
+            session_id: Unique identifier for the session.
+            
+        Returns:
+            Optional[Dict[str, Any]]: Session data if found, None otherwise. The
+            expires_at value is in seconds since the epoch.
+        """
+        pass
+    
+    @abstractmethod
+    def update_session_expiry(self, session_id: str, expires_at: datetime) -> bool:
+        """Update the expiration timestamp of an existing session.
+        
+        Args:
+            session_id: Unique identifier for the session.
+            expires_at: New expiration timestamp for the session.
+            
+        Returns:
+            bool: True if the session exists and was updated, False otherwise.
+        """
+        pass
+    
     @abstractmethod
     def delete_session(self, session_id: str) -> bool:
         """Delete a session from the database.
@@ -177,6 +231,18 @@ class DatabaseInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def store_documents_bulk(self, rows: List[Tuple[str, str, str, int, str]]) -> int:
+        """Store metadata for several documents in a single transaction.
+        
+        Args:
+            rows: List of (username, filename, file_path, file_size, file_type) tuples.
+            
+        Returns:
+            int: Number of documents stored.
+        """
+        pass
+    
     @abstractmethod
     def get_user_documents(self, username: str) -> List[Dict[str, Any]]:
         """Retrieve document metadata for a user from the database.
@@ -189,6 +255,15 @@ class DatabaseInterface(ABC):
         """
         pass
     
+    @abstractmethod
+    def iter_all_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream all users from the database without loading them at once.
+        
+        Yields:
+            Tuple[str, Dict[str, Any]]: Username and user data.
+        """
+        pass
+    
     @abstractmethod
     def get_all_users(self) -> Dict[str, Dict[str, Any]]:
         """Retrieve all users from the database.
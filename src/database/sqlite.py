@@ -1,20 +1,349 @@
 """SQLite database implementation."""
 
 import os
+import queue
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Tuple
-
-import streamlit as st
+from typing import Dict, Iterator, List, Optional, Any, Set, Tuple
 
 from src.utils.logger import logger
 from src.utils.config import Config
 from src.database.base import DatabaseInterface
 
+# Bump when a migration is added to SQLiteDatabase._migration_sql
+SCHEMA_VERSION = 2
+
+# Tables whose ISO text timestamps became epoch seconds in schema version 2,
+# mapped to their timestamp columns
+_V2_TIMESTAMP_COLUMNS = {
+    "users": ("created_at", "last_login"),
+    "activity_logs": ("timestamp",),
+    "chat_history": ("timestamp",),
+    "documents": ("upload_timestamp",),
+}
+
+# Tables and indexes of the current schema, applied with a single executescript()
+SCHEMA_SQL = '''
+CREATE TABLE IF NOT EXISTS users (
+    username TEXT PRIMARY KEY,
+    password_hash TEXT NOT NULL,
+    is_admin BOOLEAN NOT NULL,
+    created_at INTEGER NOT NULL,
+    last_login INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    created_at INTEGER NOT NULL,
+    expires_at INTEGER NOT NULL,
+    FOREIGN KEY (username) REFERENCES users(username)
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions(expires_at);
+
+CREATE TABLE IF NOT EXISTS activity_logs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp INTEGER NOT NULL,
+    username TEXT NOT NULL,
+    activity TEXT NOT NULL,
+    details TEXT,
+    FOREIGN KEY (username) REFERENCES users(username)
+);
+CREATE INDEX IF NOT EXISTS idx_logs_ts ON activity_logs(timestamp);
+
+CREATE TABLE IF NOT EXISTS chat_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    message TEXT NOT NULL,
+    response TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    FOREIGN KEY (username) REFERENCES users(username),
+    FOREIGN KEY (session_id) REFERENCES sessions(session_id)
+);
+CREATE INDEX IF NOT EXISTS idx_chat_user_session_ts ON chat_history(username, session_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_chat_user_ts ON chat_history(username, timestamp);
+
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    file_path TEXT NOT NULL,
+    upload_timestamp INTEGER NOT NULL,
+    file_size INTEGER NOT NULL,
+    file_type TEXT NOT NULL,
+    FOREIGN KEY (username) REFERENCES users(username)
+);
+CREATE INDEX IF NOT EXISTS idx_docs_user_ts ON documents(username, upload_timestamp);
+'''
+
+# Page size for newly created database files
+PAGE_SIZE = 8192
+
+# Prepared statements kept per connection; comfortably above the number of
+# distinct statements SQLiteDatabase issues so none are evicted and re-parsed
+STATEMENT_CACHE_SIZE = 256
+
+
+def _init_conn(conn: sqlite3.Connection) -> None:
+    """Apply the per-connection PRAGMAs used by every pooled connection.
+    
+    journal_mode is not set here: WAL is stored in the database file, so
+    SQLiteDatabase.initialize() switches it on once.
+    
+    Foreign keys are left off on purpose. The schema has no ON DELETE
+    actions, so enforcing them would make delete_user() and session
+    cleanup fail whenever chat history or logs reference the row.
+    
+    Args:
+        conn: Connection to configure.
+    """
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    # Keep temporary tables and the hot pages of the auth tables in memory
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-20000")
+
+
+def _is_in_memory(db_path: str) -> bool:
+    """Check whether a database path opens a private, per-connection database.
+    
+    SQLite builds with URI filenames enabled parse "file:" paths as URIs,
+    so "file::memory:" and "mode=memory" URIs are in-memory as well.
+    
+    Args:
+        db_path: Path to the SQLite database file.
+    
+    Returns:
+        bool: True if every connection to the path gets its own database.
+    """
+    if db_path in (":memory:", ""):
+        return True
+    if db_path.startswith("file:"):
+        path, _, query = db_path[len("file:"):].partition("?")
+        return path == ":memory:" or "mode=memory" in query.split("&")
+    return False
+
+
+def _open_conn(db_path: str) -> sqlite3.Connection:
+    """Open and configure a connection usable from any thread.
+    
+    Args:
+        db_path: Path to the SQLite database file.
+    
+    Returns:
+        sqlite3.Connection: New autocommit connection.
+    """
+    conn = sqlite3.connect(
+        db_path,
+        check_same_thread=False,
+        isolation_level=None,
+        cached_statements=STATEMENT_CACHE_SIZE
+    )
+    _init_conn(conn)
+    # Rows support both index and name access and convert with dict()
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def _close_conn(conn: sqlite3.Connection, optimize: bool = True) -> None:
+    """Close a pooled connection, refreshing planner statistics first.
+    
+    Args:
+        conn: Connection to close.
+        optimize: Whether to run PRAGMA optimize, which may write statistics
+            and so fails on query_only connections.
+    """
+    try:
+        if optimize:
+            conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+
+
+def _iso(column: str) -> str:
+    """Build a select expression returning an epoch column as local ISO time.
+    
+    Args:
+        column: Name of the INTEGER timestamp column.
+    
+    Returns:
+        str: SQL expression aliased to the column name.
+    """
+    return f"strftime('%Y-%m-%dT%H:%M:%S', {column}, 'unixepoch', 'localtime') AS {column}"
+
+
+def _user_dict(row: sqlite3.Row) -> Dict[str, Any]:
+    """Convert a users row to the user data returned by the interface.
+    
+    Args:
+        row: Row selected from the users table.
+    
+    Returns:
+        Dict[str, Any]: User data.
+    """
+    user = dict(row)
+    user["is_admin"] = bool(user["is_admin"])
+    return user
+
+
+class SQLiteConnectionPool:
+    """Fixed-size pool of SQLite connections."""
+    
+    def __init__(self, db_path: str, size: int = 5, timeout: float = 30.0, recycle: int = 3600,
+                 read_only: bool = False):
+        """Initialize the connection pool.
+        
+        Connections are opened lazily, up to ``size`` at a time.
+        
+        Args:
+            db_path: Path to the SQLite database file.
+            size: Maximum number of open connections.
+            timeout: Seconds to wait for a free connection before giving up.
+            recycle: Seconds after which a connection is closed on release (0 disables).
+            read_only: Whether connections reject writes (PRAGMA query_only).
+        """
+        self.db_path = db_path
+        self.read_only = read_only
+        in_memory = _is_in_memory(db_path)
+        # Every connection to ":memory:" is a separate database, so share a single one
+        self.size = 1 if in_memory else max(1, size)
+        self.timeout = timeout
+        self.recycle = 0 if in_memory else recycle
+        self._idle: "queue.LifoQueue[Tuple[sqlite3.Connection, float]]" = queue.LifoQueue(maxsize=self.size)
+        self._created = 0
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open and configure a new connection.
+        
+        Returns:
+            sqlite3.Connection: New autocommit connection.
+        """
+        conn = _open_conn(self.db_path)
+        if self.read_only:
+            conn.execute("PRAGMA query_only=ON")
+        return conn
+    
+    def _checkout(self) -> Tuple[sqlite3.Connection, float]:
+        """Take an idle connection, opening a new one if the pool is not full.
+        
+        Returns:
+            Tuple[sqlite3.Connection, float]: Connection and its creation time.
+        """
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            can_open = self._created < self.size
+            if can_open:
+                self._created += 1
+        
+        if can_open:
+            try:
+                return self._connect(), time.monotonic()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Timed out after {self.timeout}s waiting for a database connection"
+            )
+    
+    def _checkin(self, conn: sqlite3.Connection, created_at: float) -> None:
+        """Return a connection to the pool, closing it if it is due for recycling.
+        
+        Args:
+            conn: Connection to return.
+            created_at: Monotonic time the connection was opened.
+        """
+        if conn.in_transaction:
+            conn.rollback()
+        
+        if self.recycle and time.monotonic() - created_at > self.recycle:
+            _close_conn(conn, optimize=not self.read_only)
+            with self._lock:
+                self._created -= 1
+            return
+        
+        self._idle.put_nowait((conn, created_at))
+    
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a connection for the duration of the ``with`` block.
+        
+        Yields:
+            sqlite3.Connection: Pooled connection.
+        """
+        conn, created_at = self._checkout()
+        try:
+            yield conn
+        finally:
+            self._checkin(conn, created_at)
+    
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            _close_conn(conn, optimize=not self.read_only)
+            with self._lock:
+                self._created -= 1
+
 
 class SQLiteDatabase(DatabaseInterface):
     """SQLite database implementation."""
     
+    __slots__ = (
+        "db_path", "pool", "_writer", "_write_lock", "_local",
+        "_usernames", "_stop", "_cleanup_thread"
+    )
+    
+    # Rows fetched per round trip when streaming results
+    FETCH_PAGE_SIZE = 256
+    
+    # Statements are kept as constants so each connection's sqlite3 statement
+    # cache, which is keyed by SQL text, reuses the prepared form. Timestamps
+    # are stored as epoch seconds and returned as ISO strings.
+    # Upserts update in place, keeping created_at and last_login of existing rows
+    _SQL_STORE_USER = (
+        "INSERT INTO users (username, password_hash, is_admin, created_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(username) DO UPDATE SET password_hash = excluded.password_hash, is_admin = excluded.is_admin"
+    )
+    _SQL_GET_USER = f"SELECT username, password_hash, is_admin, {_iso('created_at')}, {_iso('last_login')} FROM users WHERE username = ?"
+    _SQL_UPDATE_USER_LOGIN = "UPDATE users SET last_login = ? WHERE username = ?"
+    _SQL_UPDATE_USER_PASSWORD = "UPDATE users SET password_hash = ? WHERE username = ?"
+    _SQL_DELETE_USER = "DELETE FROM users WHERE username = ?"
+    _SQL_STORE_SESSION = (
+        "INSERT INTO sessions (session_id, username, created_at, expires_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(session_id) DO UPDATE SET username = excluded.username, expires_at = excluded.expires_at"
+    )
+    _SQL_GET_SESSION = f"SELECT session_id, username, {_iso('created_at')}, expires_at FROM sessions WHERE session_id = ?"
+    _SQL_UPDATE_SESSION_EXPIRY = "UPDATE sessions SET expires_at = ? WHERE session_id = ?"
+    _SQL_DELETE_SESSION = "DELETE FROM sessions WHERE session_id = ?"
+    _SQL_CLEANUP_SESSIONS = "DELETE FROM sessions WHERE expires_at < ?"
+    _SQL_LOG_ACTIVITY = "INSERT INTO activity_logs (timestamp, username, activity, details) VALUES (?, ?, ?, ?)"
+    _SQL_GET_ACTIVITY_LOGS = f"SELECT {_iso('timestamp')}, username, activity, details FROM activity_logs ORDER BY activity_logs.timestamp DESC, id DESC LIMIT ?"
+    _SQL_STORE_CHAT = "INSERT INTO chat_history (username, session_id, message, response, timestamp) VALUES (?, ?, ?, ?, ?)"
+    _SQL_GET_SESSION_CHAT = "SELECT message, response FROM chat_history WHERE username = ? AND session_id = ? ORDER BY timestamp, id"
+    _SQL_GET_USER_CHAT = "SELECT message, response FROM chat_history WHERE username = ? ORDER BY timestamp, id"
+    _SQL_STORE_DOCUMENT = "INSERT INTO documents (username, filename, file_path, upload_timestamp, file_size, file_type) VALUES (?, ?, ?, ?, ?, ?)"
+    _SQL_GET_USER_DOCUMENTS = f"SELECT filename, file_path, {_iso('upload_timestamp')}, file_size, file_type FROM documents WHERE username = ? ORDER BY documents.upload_timestamp DESC, id DESC"
+    _SQL_GET_USERNAMES = "SELECT username FROM users"
+    _SQL_GET_ALL_USERS = f"SELECT username, password_hash, is_admin, {_iso('created_at')}, {_iso('last_login')} FROM users"
+    
     def __init__(self, db_path: Optional[str] = None):
         """Initialize the SQLite database.
         
@@ -22,88 +351,84 @@ class SQLiteDatabase(DatabaseInterface):
             db_path: Path to the SQLite database file.
         """
         self.db_path = db_path or Config.SQLITE_DB_PATH
-        self.conn = None
+        self.pool: Optional[SQLiteConnectionPool] = None
+        # Reads go through the pool; all writes share one connection, so
+        # concurrent writers queue on the lock instead of on SQLITE_BUSY
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.RLock()
+        # Connection of the transaction open on the current thread, if any
+        self._local = threading.local()
+        # Every stored username. Lookups of unknown users, such as brute-force
+        # logins, are answered from here without touching SQLite.
+        self._usernames: Set[str] = set()
+        # Background sweep of expired sessions, stopped by close()
+        self._stop = threading.Event()
+        self._cleanup_thread: Optional[threading.Thread] = None
     
     def initialize(self) -> bool:
-        """Initialize the database connection and create necessary tables.
+        """Initialize the connection pool and create necessary tables.
         
         Returns:
             bool: True if initialization is successful, False otherwise.
         """
         try:
             # Ensure directory exists
-            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
-            
-            # Connect to database
-            self.conn = sqlite3.connect(self.db_path)
-            cursor = self.conn.cursor()
-            
-            # Create users table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                username TEXT PRIMARY KEY,
-                password_hash TEXT NOT NULL,
-                is_admin BOOLEAN NOT NULL,
-                created_at TEXT NOT NULL,
-                last_login TEXT
-            )
-            ''')
-            
-            # Create sessions table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sessions (
-                session_id TEXT PRIMARY KEY,
-                username TEXT NOT NULL,
-                created_at TEXT NOT NULL,
-                expires_at TEXT NOT NULL,
-                FOREIGN KEY (username) REFERENCES users(username)
-            )
-            ''')
-            
-            # Create activity logs table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS activity_logs (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                timestamp TEXT NOT NULL,
-                username TEXT NOT NULL,
-                activity TEXT NOT NULL,
-                details TEXT,
-                FOREIGN KEY (username) REFERENCES users(username)
-            )
-            ''')
-            
-            # Create chat history table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS chat_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                session_id TEXT NOT NULL,
-                message TEXT NOT NULL,
-                response TEXT NOT NULL,
-                timestamp TEXT NOT NULL,
-                FOREIGN KEY (username) REFERENCES users(username),
-                FOREIGN KEY (session_id) REFERENCES sessions(session_id)
-            )
-            ''')
-            
-            # Create documents table
-            cursor.execute('''
-            CREATE TABLE IF NOT EXISTS documents (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                username TEXT NOT NULL,
-                filename TEXT NOT NULL,
-                file_path TEXT NOT NULL,
-                upload_timestamp TEXT NOT NULL,
-                file_size INTEGER NOT NULL,
-                file_type TEXT NOT NULL,
-                FOREIGN KEY (username) REFERENCES users(username)
+            db_dir = os.path.dirname(self.db_path)
+            if db_dir:
+                os.makedirs(db_dir, exist_ok=True)
+            
+            in_memory = _is_in_memory(self.db_path)
+            
+            # A ":memory:" database exists only on its single pooled connection,
+            # which then serves both reads and writes
+            self.pool = SQLiteConnectionPool(
+                self.db_path,
+                size=Config.SQLITE_POOL_SIZE,
+                timeout=Config.SQLITE_POOL_TIMEOUT,
+                recycle=Config.SQLITE_POOL_RECYCLE,
+                read_only=not in_memory
             )
-            ''')
             
-            self.conn.commit()
-            
-            # Save connection to session state
-            st.session_state.db_connection = self.conn
+            if not in_memory:
+                self._writer = _open_conn(self.db_path)
+                # Only takes effect on a new file, so it must precede WAL and the
+                # first CREATE TABLE; larger pages suit multi-KB chat messages
+                self._writer.execute(f"PRAGMA page_size={PAGE_SIZE}")
+                # Persistent: readers no longer block on writers, and commits
+                # with synchronous=NORMAL skip the per-transaction fsync
+                self._writer.execute("PRAGMA journal_mode=WAL")
+            
+            # Migrate and create the schema in one script and one transaction
+            with self._write_connection() as conn:
+                before, after, legacy_tables = self._migration_sql(conn)
+                try:
+                    conn.executescript(
+                        "BEGIN IMMEDIATE;\n"
+                        + "".join(f"{statement};\n" for statement in before)
+                        + SCHEMA_SQL
+                        + "".join(f"{statement};\n" for statement in after)
+                        + f"PRAGMA user_version = {SCHEMA_VERSION};\n"
+                        + "COMMIT;"
+                    )
+                except Exception:
+                    if conn.in_transaction:
+                        conn.rollback()
+                    raise
+            
+            if legacy_tables:
+                logger.info(f"Migrated timestamps of tables: {', '.join(legacy_tables)}")
+            
+            with self._connection() as conn:
+                self._usernames = {row[0] for row in conn.execute(self._SQL_GET_USERNAMES)}
+            
+            # Expired sessions are purged here rather than on a user request
+            self._stop.clear()
+            self._cleanup_thread = threading.Thread(
+                target=self._cleanup_loop,
+                name="sqlite-session-cleanup",
+                daemon=True
+            )
+            self._cleanup_thread.start()
             
             logger.info(f"Initialized SQLite database at {self.db_path}")
             return True
@@ -111,13 +436,150 @@ class SQLiteDatabase(DatabaseInterface):
             logger.error(f"Error initializing SQLite database: {str(e)}")
             return False
     
+    def _migration_sql(self, conn: sqlite3.Connection) -> Tuple[List[str], List[str], List[str]]:
+        """Build the statements upgrading tables created by older schema versions.
+        
+        Tables whose rows must be converted are renamed out of the way before
+        SCHEMA_SQL recreates them, and their rows are copied back afterwards.
+        
+        Args:
+            conn: Connection to the database being initialized.
+        
+        Returns:
+            Tuple[List[str], List[str], List[str]]: Statements to run before
+            SCHEMA_SQL, statements to run after it, and the migrated tables.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        before: List[str] = []
+        after: List[str] = []
+        legacy_tables: List[str] = []
+        
+        if version < 2:
+            # Session expiry moved from ISO text to epoch seconds (version 1),
+            # then creation time did too. Sessions are short-lived, so the old
+            # table is dropped rather than converted.
+            before.append("DROP TABLE IF EXISTS sessions")
+            
+            existing = {
+                row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+            for table, timestamp_columns in _V2_TIMESTAMP_COLUMNS.items():
+                if table not in existing:
+                    continue
+                
+                # Column affinity can't be changed in place, so rebuild the table,
+                # converting ISO text written in local time to epoch seconds
+                columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+                selected = [
+                    f"CAST(strftime('%s', {column}, 'utc') AS INTEGER)"
+                    if column in timestamp_columns else column
+                    for column in columns
+                ]
+                before.append(f"ALTER TABLE {table} RENAME TO {table}_v1")
+                after.append(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"SELECT {', '.join(selected)} FROM {table}_v1"
+                )
+                after.append(f"DROP TABLE {table}_v1")
+                legacy_tables.append(table)
+            
+            # Indexes follow a renamed table; drop them so they are recreated
+            # on the new one
+            for index in ("idx_logs_ts", "idx_chat_user_session_ts", "idx_chat_user_ts", "idx_docs_user_ts"):
+                before.append(f"DROP INDEX IF EXISTS {index}")
+        
+        return before, after, legacy_tables
+    
+    def _cleanup_loop(self) -> None:
+        """Delete expired sessions periodically until close() is called."""
+        while not self._stop.wait(Config.SESSION_CLEANUP_INTERVAL_SECONDS):
+            self.cleanup_expired_sessions()
+    
     def close(self) -> None:
-        """Close the database connection."""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Close the database connections."""
+        self._stop.set()
+        if self._cleanup_thread:
+            self._cleanup_thread.join()
+            self._cleanup_thread = None
+        
+        with self._write_lock:
+            if self._writer:
+                _close_conn(self._writer)
+                self._writer = None
+        
+        if self.pool:
+            self.pool.close()
+            self.pool = None
             logger.info("Closed SQLite database connection")
     
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Get the connection for a single read statement.
+        
+        Inside transaction() this is the transaction's connection, so reads
+        see its uncommitted writes. Otherwise a connection borrowed from the
+        read pool.
+        
+        Yields:
+            sqlite3.Connection: Connection to execute on.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        
+        with self.pool.acquire() as conn:
+            yield conn
+    
+    @contextmanager
+    def _write_connection(self) -> Iterator[sqlite3.Connection]:
+        """Get the connection for a single write statement.
+        
+        Inside transaction() this is the transaction's connection, otherwise
+        the shared writer, held under the write lock.
+        
+        Yields:
+            sqlite3.Connection: Connection to execute on.
+        """
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+        
+        with self._write_lock:
+            if self._writer is not None:
+                yield self._writer
+            else:
+                with self.pool.acquire() as conn:
+                    yield conn
+    
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group the writes made inside a ``with`` block into one transaction.
+        
+        Methods called inside the block run on the same connection and are
+        committed together, which costs a single commit instead of one per
+        write. Nested calls join the outer transaction.
+        
+        Yields:
+            None
+        """
+        if getattr(self._local, "conn", None) is not None:
+            yield
+            return
+        
+        with self._write_connection() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._local.conn = conn
+            try:
+                yield
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._local.conn = None
+    
     def store_user(self, username: str, password_hash: str, is_admin: bool = False) -> bool:
         """Store user data in the database.
         
@@ -125,21 +587,21 @@ class SQLiteDatabase(DatabaseInterface):
             username: Username of the user.
             password_hash: Hashed password of the user.
             is_admin: Whether the user is an admin.
-            
+        
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            created_at = datetime.now().isoformat()
+            created_at = int(time.time())
             
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO users (username, password_hash, is_admin, created_at) VALUES (?, ?, ?, ?)",
-                (username, password_hash, is_admin, created_at)
-            )
-            self.conn.commit()
+            with self._write_connection() as conn:
+                conn.execute(
+                    self._SQL_STORE_USER,
+                    (username, password_hash, is_admin, created_at)
+                )
             
-            logger.info(f"Stored user: {username}")
+            self._usernames.add(username)
+            logger.debug("Stored user: %s", username)
             return True
         except Exception as e:
             logger.error(f"Error storing user {username}: {str(e)}")
@@ -150,26 +612,22 @@ class SQLiteDatabase(DatabaseInterface):
         
         Args:
             username: Username of the user.
-            
+        
         Returns:
             Optional[Dict[str, Any]]: User data if found, None otherwise.
         """
+        if username not in self._usernames:
+            return None
+        
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "SELECT username, password_hash, is_admin, created_at, last_login FROM users WHERE username = ?",
-                (username,)
-            )
-            user_data = cursor.fetchone()
+            with self._connection() as conn:
+                user_data = conn.execute(
+                    self._SQL_GET_USER,
+                    (username,)
+                ).fetchone()
             
             if user_data:
-                return {
-                    "username": user_data[0],
-                    "password_hash": user_data[1],
-                    "is_admin": bool(user_data[2]),
-                    "created_at": user_data[3],
-                    "last_login": user_data[4]
-                }
+                return _user_dict(user_data)
             return None
         except Exception as e:
             logger.error(f"Error getting user {username}: {str(e)}")
@@ -180,41 +638,63 @@ class SQLiteDatabase(DatabaseInterface):
         
         Args:
             username: Username of the user.
-            
+        
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            last_login = datetime.now().isoformat()
+            last_login = int(time.time())
             
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "UPDATE users SET last_login = ? WHERE username = ?",
-                (last_login, username)
-            )
-            self.conn.commit()
+            with self._write_connection() as conn:
+                conn.execute(
+                    self._SQL_UPDATE_USER_LOGIN,
+                    (last_login, username)
+                )
             
-            logger.info(f"Updated last login for user: {username}")
+            logger.debug("Updated last login for user: %s", username)
             return True
         except Exception as e:
             logger.error(f"Error updating last login for user {username}: {str(e)}")
             return False
     
+    def update_user_password(self, username: str, password_hash: str) -> bool:
+        """Replace the password hash of a user.
+        
+        Args:
+            username: Username of the user.
+            password_hash: New hashed password of the user.
+            
+        Returns:
+            bool: True if the operation is successful, False otherwise.
+        """
+        try:
+            with self._write_connection() as conn:
+                conn.execute(
+                    self._SQL_UPDATE_USER_PASSWORD,
+                    (password_hash, username)
+                )
+            
+            logger.debug("Updated password hash for user: %s", username)
+            return True
+        except Exception as e:
+            logger.error(f"Error updating password hash for user {username}: {str(e)}")
+            return False
+    
     def delete_user(self, username: str) -> bool:
         """Delete a user from the database.
         
         Args:
             username: Username of the user.
-            
+        
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM users WHERE username = ?", (username,))
-            self.conn.commit()
+            with self._write_connection() as conn:
+                conn.execute(self._SQL_DELETE_USER, (username,))
             
-            logger.info(f"Deleted user: {username}")
+            self._usernames.discard(username)
+            logger.debug("Deleted user: %s", username)
             return True
         except Exception as e:
             logger.error(f"Error deleting user {username}: {str(e)}")
@@ -227,42 +707,85 @@ class SQLiteDatabase(DatabaseInterface):
             session_id: Unique identifier for the session.
             username: Username of the user.
             expires_at: Expiration timestamp for the session.
-            
+        
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            created_at = datetime.now().isoformat()
-            expires_at_iso = expires_at.isoformat()
+            created_at = int(time.time())
+            expires_at_ts = int(expires_at.timestamp())
             
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "INSERT OR REPLACE INTO sessions (session_id, username, created_at, expires_at) VALUES (?, ?, ?, ?)",
-                (session_id, username, created_at, expires_at_iso)
-            )
-            self.conn.commit()
+            with self._write_connection() as conn:
+                conn.execute(
+                    self._SQL_STORE_SESSION,
+                    (session_id, username, created_at, expires_at_ts)
+                )
             
-            logger.info(f"Stored session: {session_id} for user: {username}")
+            logger.debug("Stored session: %s for user: %s", session_id, username)
             return True
         except Exception as e:
             logger.error(f"Error storing session {session_id}: {str(e)}")
             return False
     
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve session data from the database.
+        
+        Args:
+            session_id: Unique identifier for the session.
+            
+        Returns:
+            Optional[Dict[str, Any]]: Session data if found, None otherwise.
+        """
+        try:
+            with self._connection() as conn:
+                session_data = conn.execute(
+                    self._SQL_GET_SESSION,
+                    (session_id,)
+                ).fetchone()
+            
+            if session_data:
+                return dict(session_data)
+            return None
+        except Exception as e:
+            logger.error(f"Error getting session {session_id}: {str(e)}")
+            return None
+    
+    def update_session_expiry(self, session_id: str, expires_at: datetime) -> bool:
+        """Update the expiration timestamp of an existing session.
+        
+        Args:
+            session_id: Unique identifier for the session.
+            expires_at: New expiration timestamp for the session.
+            
+        Returns:
+            bool: True if the session exists and was updated, False otherwise.
+        """
+        try:
+            with self._write_connection() as conn:
+                cursor = conn.execute(
+                    self._SQL_UPDATE_SESSION_EXPIRY,
+                    (int(expires_at.timestamp()), session_id)
+                )
+            
+            return cursor.rowcount > 0
+        except Exception as e:
+            logger.error(f"Error updating session {session_id}: {str(e)}")
+            return False
+    
     def delete_session(self, session_id: str) -> bool:
         """Delete a session from the database.
         
         Args:
             session_id: Unique identifier for the session.
-            
+        
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
-            self.conn.commit()
+            with self._write_connection() as conn:
+                conn.execute(self._SQL_DELETE_SESSION, (session_id,))
             
-            logger.info(f"Deleted session: {session_id}")
+            logger.debug("Deleted session: %s", session_id)
             return True
         except Exception as e:
             logger.error(f"Error deleting session {session_id}: {str(e)}")
@@ -275,14 +798,13 @@ class SQLiteDatabase(DatabaseInterface):
             int: Number of sessions removed.
         """
         try:
-            current_time = datetime.now().isoformat()
+            current_time = int(time.time())
             
-            cursor = self.conn.cursor()
-            cursor.execute("DELETE FROM sessions WHERE expires_at < ?", (current_time,))
-            deleted_count = cursor.rowcount
-            self.conn.commit()
+            with self._write_connection() as conn:
+                cursor = conn.execute(self._SQL_CLEANUP_SESSIONS, (current_time,))
+                deleted_count = cursor.rowcount
             
-            logger.info(f"Cleaned up {deleted_count} expired sessions")
+            logger.debug("Cleaned up %d expired sessions", deleted_count)
             return deleted_count
         except Exception as e:
             logger.error(f"Error cleaning up expired sessions: {str(e)}")
@@ -295,21 +817,20 @@ class SQLiteDatabase(DatabaseInterface):
             username: Username of the user.
             activity: Type of activity.
             details: Additional details about the activity.
-            
+        
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            timestamp = datetime.now().isoformat()
+            timestamp = int(time.time())
             
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "INSERT INTO activity_logs (timestamp, username, activity, details) VALUES (?, ?, ?, ?)",
-                (timestamp, username, activity, details)
-            )
-            self.conn.commit()
+            with self._write_connection() as conn:
+                conn.execute(
+                    self._SQL_LOG_ACTIVITY,
+                    (timestamp, username, activity, details)
+                )
             
-            logger.info(f"Logged activity: {username} - {activity}")
+            logger.debug("Logged activity: %s - %s", username, activity)
             return True
         except Exception as e:
             logger.error(f"Error logging activity: {str(e)}")
@@ -320,27 +841,18 @@ class SQLiteDatabase(DatabaseInterface):
         
         Args:
             limit: Maximum number of logs to retrieve.
-            
+        
         Returns:
             List[Dict[str, Any]]: List of activity logs.
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "SELECT timestamp, username, activity, details FROM activity_logs ORDER BY timestamp DESC LIMIT ?",
-                (limit,)
-            )
-            logs = cursor.fetchall()
-            
-            return [
-                {
-                    "timestamp": log[0],
-                    "username": log[1],
-                    "activity": log[2],
-                    "details": log[3]
-                }
-                for log in logs
-            ]
+            with self._connection() as conn:
+                logs = conn.execute(
+                    self._SQL_GET_ACTIVITY_LOGS,
+                    (limit,)
+                ).fetchall()
+            
+            return [dict(log) for log in logs]
         except Exception as e:
             logger.error(f"Error getting activity logs: {str(e)}")
             return []
@@ -353,21 +865,20 @@ class SQLiteDatabase(DatabaseInterface):
             session_id: Unique identifier for the session.
             message: User's message.
             response: System's response.
-            
+        
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            timestamp = datetime.now().isoformat()
+            timestamp = int(time.time())
             
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "INSERT INTO chat_history (username, session_id, message, response, timestamp) VALUES (?, ?, ?, ?, ?)",
-                (username, session_id, message, response, timestamp)
-            )
-            self.conn.commit()
+            with self._write_connection() as conn:
+                conn.execute(
+                    self._SQL_STORE_CHAT,
+                    (username, session_id, message, response, timestamp)
+                )
             
-            logger.info(f"Stored chat history for user: {username}")
+            logger.debug("Stored chat history for user: %s", username)
             return True
         except Exception as e:
             logger.error(f"Error storing chat history: {str(e)}")
@@ -379,26 +890,28 @@ class SQLiteDatabase(DatabaseInterface):
         Args:
             username: Username of the user.
             session_id: Optional session ID to filter by.
-            
+        
         Returns:
             List[Tuple[str, str]]: List of (message, response) tuples.
         """
         try:
-            cursor = self.conn.cursor()
-            
-            if session_id:
-                cursor.execute(
-                    "SELECT message, response FROM chat_history WHERE username = ? AND session_id = ? ORDER BY timestamp",
-                    (username, session_id)
-                )
-            else:
-                cursor.execute(
-                    "SELECT message, response FROM chat_history WHERE username = ? ORDER BY timestamp",
-                    (username,)
-                )
+            with self._connection() as conn:
+                # Plain tuple rows are already the (message, response) pairs
+                # returned, so they need no per-row conversion
+                cursor = conn.cursor()
+                cursor.row_factory = None
+                if session_id:
+                    cursor.execute(
+                        self._SQL_GET_SESSION_CHAT,
+                        (username, session_id)
+                    )
+                else:
+                    cursor.execute(
+                        self._SQL_GET_USER_CHAT,
+                        (username,)
+                    )
                 
-            history = cursor.fetchall()
-            return [(entry[0], entry[1]) for entry in history]
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"Error getting chat history: {str(e)}")
             return []
@@ -412,78 +925,97 @@ class SQLiteDatabase(DatabaseInterface):
             file_path: Path to the file.
             file_size: Size of the file in bytes.
             file_type: MIME type of the file.
-            
+        
         Returns:
             bool: True if the operation is successful, False otherwise.
         """
         try:
-            timestamp = datetime.now().isoformat()
+            timestamp = int(time.time())
             
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "INSERT INTO documents (username, filename, file_path, upload_timestamp, file_size, file_type) VALUES (?, ?, ?, ?, ?, ?)",
-                (username, filename, file_path, timestamp, file_size, file_type)
-            )
-            self.conn.commit()
+            with self._write_connection() as conn:
+                conn.execute(
+                    self._SQL_STORE_DOCUMENT,
+                    (username, filename, file_path, timestamp, file_size, file_type)
+                )
             
-            logger.info(f"Stored document metadata for file: {filename}")
+            logger.debug("Stored document metadata for file: %s", filename)
             return True
         except Exception as e:
             logger.error(f"Error storing document metadata: {str(e)}")
             return False
     
+    def store_documents_bulk(self, rows: List[Tuple[str, str, str, int, str]]) -> int:
+        """Store metadata for several documents in a single transaction.
+        
+        Args:
+            rows: List of (username, filename, file_path, file_size, file_type) tuples.
+        
+        Returns:
+            int: Number of documents stored.
+        """
+        try:
+            timestamp = int(time.time())
+            
+            with self.transaction(), self._write_connection() as conn:
+                conn.executemany(
+                    self._SQL_STORE_DOCUMENT,
+                    [
+                        (username, filename, file_path, timestamp, file_size, file_type)
+                        for username, filename, file_path, file_size, file_type in rows
+                    ]
+                )
+            
+            logger.info("Stored document metadata for %d files", len(rows))
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error storing document metadata: {str(e)}")
+            return 0
+    
     def get_user_documents(self, username: str) -> List[Dict[str, Any]]:
         """Retrieve document metadata for a user from the database.
         
         Args:
             username: Username of the user.
-            
+        
         Returns:
             List[Dict[str, Any]]: List of document metadata.
         """
         try:
-            cursor = self.conn.cursor()
-            cursor.execute(
-                "SELECT filename, file_path, upload_timestamp, file_size, file_type FROM documents WHERE username = ? ORDER BY upload_timestamp DESC",
-                (username,)
-            )
-            documents = cursor.fetchall()
-            
-            return [
-                {
-                    "filename": doc[0],
-                    "file_path": doc[1],
-                    "upload_timestamp": doc[2],
-                    "file_size": doc[3],
-                    "file_type": doc[4]
-                }
-                for doc in documents
-            ]
+            with self._connection() as conn:
+                documents = conn.execute(
+                    self._SQL_GET_USER_DOCUMENTS,
+                    (username,)
+                ).fetchall()
+            
+            return [dict(doc) for doc in documents]
         except Exception as e:
             logger.error(f"Error getting user documents: {str(e)}")
             return []
     
+    def iter_all_users(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """Stream all users from the database a page of rows at a time.
+        
+        A pooled connection is held until the iterator is exhausted or closed.
+        
+        Yields:
+            Tuple[str, Dict[str, Any]]: Username and user data.
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute(self._SQL_GET_ALL_USERS)
+                while True:
+                    users = cursor.fetchmany(self.FETCH_PAGE_SIZE)
+                    if not users:
+                        break
+                    for user in users:
+                        yield user["username"], _user_dict(user)
+        except Exception as e:
+            logger.error(f"Error getting all users: {str(e)}")
+    
     def get_all_users(self) -> Dict[str, Dict[str, Any]]:
         """Retrieve all users from the database.
         
         Returns:
             Dict[str, Dict[str, Any]]: Dictionary of username to user data.
         """
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("SELECT username, password_hash, is_admin, created_at, last_login FROM users")
-            users = cursor.fetchall()
-            
-            return {
-                user[0]: {
-                    "username": user[0],
-                    "password_hash": user[1],
-                    "is_admin": bool(user[2]),
-                    "created_at": user[3],
-                    "last_login": user[4]
-                }
-                for user in users
-            }
-        except Exception as e:
-            logger.error(f"Error getting all users: {str(e)}")
-            return {}
+        return dict(self.iter_all_users())
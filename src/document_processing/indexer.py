@@ -1,15 +1,79 @@
 """Document indexing utilities."""
 
+import functools
 from typing import List, Optional
 
 import streamlit as st
-from llama_index.core import StorageContext, VectorStoreIndex
+from llama_index.core import Settings, StorageContext, VectorStoreIndex
 from llama_index.core import Document as LlamaDocument
+from llama_index.core.ingestion import IngestionPipeline
+from llama_index.core.vector_stores import ExactMatchFilter, MetadataFilters
 from llama_index.vector_stores.milvus import MilvusVectorStore
 
 from src.utils.logger import logger
 from src.utils.config import Config
-from src.vector_store.milvus import get_vector_store
+from src.utils.security import sha256_many
+from src.vector_store.milvus import clear_semantic_cache, get_vector_store, indexed_doc_ids
+
+# Node metadata key holding the user who uploaded the document
+OWNER_METADATA_KEY = "username"
+
+
+def _session_user() -> Optional[str]:
+    """Get the user logged in to this session.
+    
+    Returns:
+        Optional[str]: Username if a user is logged in, None otherwise.
+    """
+    return st.session_state.get("current_user")
+
+
+@functools.lru_cache(maxsize=8)
+def _build_query_engine(index: VectorStoreIndex, similarity_top_k: int, streaming: bool,
+                        username: Optional[str] = None):
+    """Build a query engine, reusing it for repeated requests on the same index.
+    
+    Indexes hash by identity, and the cache holds a reference to each cached
+    index, so a rebuilt index always gets a fresh engine.
+    
+    Args:
+        index: Vector index to query.
+        similarity_top_k: Number of similar documents to retrieve.
+        streaming: Whether to enable streaming responses.
+        username: Only retrieve documents uploaded by this user, if given.
+        
+    Returns:
+        Query engine for the index.
+    """
+    filters = None
+    if username is not None:
+        filters = MetadataFilters(filters=[ExactMatchFilter(key=OWNER_METADATA_KEY, value=username)])
+    
+    return index.as_query_engine(
+        similarity_top_k=similarity_top_k,
+        streaming=streaming,
+        filters=filters
+    )
+
+
+def current_vector_index() -> Optional[VectorStoreIndex]:
+    """Get this session's vector index, if it is still backed by the shared store.
+    
+    After the collection is rebuilt, the index and its query engine are
+    dropped from the session, so documents have to be loaded again.
+    
+    Returns:
+        Optional[VectorStoreIndex]: Vector index if available, None otherwise.
+    """
+    index = st.session_state.get("vector_index")
+    if index is not None and index.vector_store is not get_vector_store():
+        st.session_state.vector_index = None
+        st.session_state.query_engine = None
+        st.session_state.documents_loaded = False
+        if "query_processor" in st.session_state:
+            st.session_state.query_processor.set_query_engine(None)
+        index = None
+    return index
 
 
 class DocumentIndexer:
@@ -23,11 +87,14 @@ class DocumentIndexer:
         """
         self.vector_store = vector_store or get_vector_store()
     
-    def build_index(self, documents: List[LlamaDocument]) -> Optional[VectorStoreIndex]:
+    def build_index(self, documents: List[LlamaDocument],
+                    username: Optional[str] = None) -> Optional[VectorStoreIndex]:
         """Build an index from documents.
         
         Args:
             documents: List of documents to index.
+            username: User who uploaded the documents. Defaults to the user
+                logged in to this session.
             
         Returns:
             Optional[VectorStoreIndex]: Vector index if successful, None otherwise.
@@ -36,18 +103,64 @@ class DocumentIndexer:
             logger.warning("No documents to index.")
             return None
         
+        if username is None:
+            username = _session_user()
+        
+        # The collection is shared by all users, so each chunk records its
+        # owner, and queries only retrieve the user's own chunks. A chunk's id
+        # is the hash of its owner and text and is stored with its nodes, so
+        # chunks the user already indexed in any session or earlier run are
+        # skipped.
+        existing_index = current_vector_index()
+        owner_prefix = f"{username or ''}\0".encode()
+        unique_documents = {}
+        digests = sha256_many(owner_prefix + doc.text.encode() for doc in documents)
+        for doc, digest in zip(documents, digests):
+            doc.id_ = digest.hex()
+            if username is not None:
+                doc.metadata[OWNER_METADATA_KEY] = username
+                # Ownership must not change what is embedded or shown to the LLM
+                for excluded in (doc.excluded_embed_metadata_keys, doc.excluded_llm_metadata_keys):
+                    if OWNER_METADATA_KEY not in excluded:
+                        excluded.append(OWNER_METADATA_KEY)
+            unique_documents.setdefault(doc.id_, doc)
+        
         try:
+            indexed = indexed_doc_ids(self.vector_store, list(unique_documents))
+            documents = [doc for doc_id, doc in unique_documents.items() if doc_id not in indexed]
+            if not documents:
+                logger.info("All documents are already indexed.")
+                return existing_index or VectorStoreIndex.from_vector_store(self.vector_store)
+            
             logger.info(f"Building index for {len(documents)} documents.")
             
+            # Split and embed up front so chunks go to the embedding API in
+            # batches of Settings.embed_model.embed_batch_size
+            pipeline = IngestionPipeline(
+                transformations=[Settings.text_splitter, Settings.embed_model]
+            )
+            nodes = pipeline.run(documents=documents)
+            
+            # Add to the index already built in this session, so only the new
+            # nodes are embedded and upserted (in the index's insert batch size)
+            if existing_index is not None:
+                existing_index.insert_nodes(nodes)
+                # Cached responses predate the new documents
+                clear_semantic_cache()
+                logger.info(f"Inserted {len(nodes)} nodes into the existing index.")
+                return existing_index
+            
             # Create storage context with vector store
             storage_context = StorageContext.from_defaults(vector_store=self.vector_store)
             
-            # Build index
-            index = VectorStoreIndex.from_documents(
-                documents, 
-                storage_context=storage_context
+            # Build index; nodes already carry embeddings, so this only inserts
+            index = VectorStoreIndex(
+                nodes,
+                storage_context=storage_context,
+                insert_batch_size=Config.VECTOR_INSERT_BATCH_SIZE
             )
             
+            clear_semantic_cache()
             logger.info("Successfully built index.")
             return index
         except Exception as e:
@@ -55,33 +168,29 @@ class DocumentIndexer:
             return None
     
     def get_query_engine(self, index: Optional[VectorStoreIndex] = None, 
-                         similarity_top_k: int = 20, streaming: bool = True):
+                         similarity_top_k: int = 20, streaming: bool = True,
+                         username: Optional[str] = None):
         """Get a query engine for the index.
         
         Args:
             index: Vector index to query.
             similarity_top_k: Number of similar documents to retrieve.
             streaming: Whether to enable streaming responses.
+            username: Only retrieve documents uploaded by this user. Defaults
+                to the user logged in to this session.
             
         Returns:
             Query engine for the index.
         """
-        if not index and "vector_index" in st.session_state:
-            index = st.session_state.vector_index
+        if not index:
+            index = current_vector_index()
         
         if not index:
             logger.warning("No index available for query engine.")
             return None
         
         try:
-            logger.info("Creating query engine.")
-            query_engine = index.as_query_engine(
-                similarity_top_k=similarity_top_k,
-                streaming=streaming
-            )
-            
-            logger.info("Successfully created query engine.")
-            return query_engine
+            return _build_query_engine(index, similarity_top_k, streaming, username or _session_user())
         except Exception as e:
             logger.error(f"Error creating query engine: {str(e)}")
             return None
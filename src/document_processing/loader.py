@@ -1,16 +1,40 @@
 """Document loading utilities."""
 
 import os
+import shutil
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional, Tuple
 
 import streamlit as st
 from llama_index.core import SimpleDirectoryReader
 from llama_index.core import Document as LlamaDocument
 
+from src.utils.config import Config
 from src.utils.logger import log_activity, logger
 
 
+def _load_one(file_path: str) -> List[LlamaDocument]:
+    """Load the documents of a single file.
+    
+    Errors are logged and yield no documents, so one bad file does not
+    abort the other loads. Used when loading all files at once fails.
+    
+    Args:
+        file_path: Path to the file.
+        
+    Returns:
+        List[LlamaDocument]: Documents loaded from the file.
+    """
+    try:
+        file_documents = SimpleDirectoryReader(input_files=[file_path]).load_data()
+        logger.info(f"Loaded document: {file_path}")
+        return file_documents
+    except Exception as e:
+        logger.error(f"Error loading document {file_path}: {str(e)}")
+        return []
+
+
 class DocumentLoader:
     """Document loader class."""
     
@@ -41,22 +65,31 @@ class DocumentLoader:
         for uploaded_file in uploaded_files:
             try:
                 file_path = os.path.join(self.temp_dir, uploaded_file.name)
+                # Copy in 1 MiB blocks rather than one write of the whole file
+                uploaded_file.seek(0)
                 with open(file_path, "wb") as f:
-                    f.write(uploaded_file.getbuffer())
+                    shutil.copyfileobj(uploaded_file, f, length=1 << 20)
                 file_paths.append(file_path)
                 logger.info(f"Saved file: {uploaded_file.name}")
             except Exception as e:
                 logger.error(f"Error saving file {uploaded_file.name}: {str(e)}")
         
-        # Load documents
+        # Load documents with one reader for all files; the reader skips
+        # files it fails to parse and spreads files across its workers
         documents = []
-        for file_path in file_paths:
+        if file_paths:
+            workers = min(Config.DOCUMENT_LOAD_WORKERS, len(file_paths))
             try:
-                file_documents = SimpleDirectoryReader(input_files=[file_path]).load_data()
-                documents.extend(file_documents)
-                logger.info(f"Loaded document: {file_path}")
+                reader = SimpleDirectoryReader(input_files=file_paths)
+                documents = reader.load_data(num_workers=workers if workers > 1 else None)
+                logger.info(f"Loaded documents: {', '.join(file_paths)}")
             except Exception as e:
-                logger.error(f"Error loading document {file_path}: {str(e)}")
+                # Fall back to loading file by file, so one bad file costs
+                # only its own documents
+                logger.error(f"Error loading documents, retrying per file: {str(e)}")
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for file_documents in executor.map(_load_one, file_paths):
+                        documents.extend(file_documents)
         
         if not documents:
             logger.warning("No documents loaded from uploaded files.")
@@ -75,7 +108,21 @@ class DocumentLoader:
             List[LlamaDocument]: List of loaded documents.
         """
         try:
-            documents = SimpleDirectoryReader(input_dir=directory_path).load_data()
+            # Same files the reader's own non-recursive scan would pick: no
+            # subdirectories and no hidden files
+            with os.scandir(directory_path) as entries:
+                file_paths = sorted(
+                    entry.path for entry in entries
+                    if entry.is_file() and not entry.name.startswith(".")
+                )
+            if not file_paths:
+                logger.warning(f"No files found in directory: {directory_path}")
+                return []
+            
+            workers = min(Config.DOCUMENT_LOAD_WORKERS, len(file_paths))
+            documents = SimpleDirectoryReader(input_files=file_paths).load_data(
+                num_workers=workers if workers > 1 else None
+            )
             logger.info(f"Loaded {len(documents)} documents from directory: {directory_path}")
             return documents
         except Exception as e:
@@ -85,7 +132,6 @@ class DocumentLoader:
     def cleanup(self) -> None:
         """Clean up temporary files."""
         try:
-            import shutil
             shutil.rmtree(self.temp_dir)
             logger.info(f"Cleaned up temporary directory: {self.temp_dir}")
         except Exception as e:
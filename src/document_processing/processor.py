@@ -1,6 +1,10 @@
 """Document processing utilities."""
 
-from typing import List, Dict, Any, Optional
+import functools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Dict, Any, Optional, Tuple
 
 from llama_index.core import Document as LlamaDocument
 from llama_index.core.node_parser import SentenceSplitter
@@ -8,6 +12,56 @@ from llama_index.core.node_parser import SentenceSplitter
 from src.utils.logger import logger
 from src.utils.config import Config
 
+# Below this many documents, pool startup costs more than it saves
+PARALLEL_MIN_DOCUMENTS = 4
+
+
+@functools.lru_cache(maxsize=8)
+def get_text_splitter(chunk_size: int, chunk_overlap: int) -> SentenceSplitter:
+    """Get the sentence splitter for chunk settings, built once per process.
+    
+    Args:
+        chunk_size: Size of document chunks.
+        chunk_overlap: Overlap between chunks.
+        
+    Returns:
+        SentenceSplitter: Shared splitter for the settings.
+    """
+    return SentenceSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+@functools.lru_cache(maxsize=None)
+def _split_pool() -> ProcessPoolExecutor:
+    """Start the worker pool shared by all uploads of the process.
+    
+    Workers are started through a fork server (or spawned where fork servers
+    are unavailable) rather than forked from the server process, whose live
+    threads and gRPC channels are not safe to fork.
+    
+    Returns:
+        ProcessPoolExecutor: Pool of Config.CHUNK_WORKERS processes.
+    """
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return ProcessPoolExecutor(
+        max_workers=Config.CHUNK_WORKERS,
+        mp_context=multiprocessing.get_context(method)
+    )
+
+
+def _split_text(args: Tuple[str, int, int]) -> List[str]:
+    """Split one document text into chunks.
+    
+    Module-level so it can run in pool worker processes.
+    
+    Args:
+        args: (text, chunk_size, chunk_overlap) of the document.
+        
+    Returns:
+        List[str]: Text chunks.
+    """
+    text, chunk_size, chunk_overlap = args
+    return get_text_splitter(chunk_size, chunk_overlap).split_text(text)
+
 
 class DocumentProcessor:
     """Document processor class."""
@@ -21,10 +75,7 @@ class DocumentProcessor:
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
-        self.text_splitter = SentenceSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
+        self.text_splitter = get_text_splitter(chunk_size, chunk_overlap)
     
     def process_documents(self, documents: List[LlamaDocument]) -> List[LlamaDocument]:
         """Process documents by chunking and metadata extraction.
@@ -42,24 +93,46 @@ class DocumentProcessor:
         logger.info(f"Processing {len(documents)} documents.")
         processed_documents = []
         
-        for doc in documents:
+        # Splitting is CPU-bound, so larger batches are split across processes
+        tasks = [(doc.text, self.chunk_size, self.chunk_overlap) for doc in documents]
+        futures = None
+        if len(documents) >= PARALLEL_MIN_DOCUMENTS and Config.CHUNK_WORKERS > 1:
+            try:
+                executor = _split_pool()
+                futures = [executor.submit(_split_text, task) for task in tasks]
+            except BrokenProcessPool:
+                # A worker died; start a new pool for the next upload
+                _split_pool.cache_clear()
+                futures = None
+        
+        for index, doc in enumerate(documents):
             try:
                 # Add additional metadata if available
                 if hasattr(doc, 'metadata') and doc.metadata:
                     pass  # Future enhancement: extract more metadata
                 
-                # Split document into chunks
-                chunks = self.text_splitter.split_text(doc.text)
+                # Split document into chunks; result() re-raises the
+                # document's own error from the worker
+                if futures is None:
+                    chunks = _split_text(tasks[index])
+                else:
+                    try:
+                        chunks = futures[index].result()
+                    except BrokenProcessPool:
+                        # A worker died; split the rest here and start a new
+                        # pool for the next upload
+                        _split_pool.cache_clear()
+                        futures = None
+                        chunks = _split_text(tasks[index])
                 
-                # Create a new document for each chunk
+                # Create a new document for each chunk; the document's
+                # metadata is read once and each chunk gets a single dict
+                base_metadata = getattr(doc, 'metadata', None) or {}
+                total_chunks = len(chunks)
                 for i, chunk in enumerate(chunks):
-                    chunk_metadata = doc.metadata.copy() if hasattr(doc, 'metadata') else {}
-                    chunk_metadata['chunk_id'] = i
-                    chunk_metadata['total_chunks'] = len(chunks)
-                    
                     processed_doc = LlamaDocument(
                         text=chunk,
-                        metadata=chunk_metadata
+                        metadata={**base_metadata, 'chunk_id': i, 'total_chunks': total_chunks}
                     )
                     processed_documents.append(processed_doc)
                 
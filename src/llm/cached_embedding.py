@@ -0,0 +1,376 @@
+"""NVIDIA embedding model with a content-addressed embedding cache."""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from llama_index.core.bridge.pydantic import PrivateAttr
+from llama_index.embeddings.nvidia import NVIDIAEmbedding
+
+from src.utils.config import Config
+from src.utils.logger import logger
+
+Embedding = List[float]
+
+_SQL_CREATE = "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+_SQL_INSERT = "INSERT OR IGNORE INTO embeddings (key, vector) VALUES (?, ?)"
+_SQL_SELECT = "SELECT key, vector FROM embeddings WHERE key IN ({})"
+
+# SimHash fingerprints of embedded passages, split into four 16-bit bands.
+# Fingerprints within 3 bits of each other share at least one band, so the
+# band indexes find every near-duplicate candidate.
+_SQL_CREATE_FINGERPRINTS = """
+CREATE TABLE IF NOT EXISTS fingerprints (
+    key TEXT PRIMARY KEY,
+    simhash INTEGER NOT NULL,
+    band0 INTEGER NOT NULL,
+    band1 INTEGER NOT NULL,
+    band2 INTEGER NOT NULL,
+    band3 INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band0 ON fingerprints (band0);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band1 ON fingerprints (band1);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band2 ON fingerprints (band2);
+CREATE INDEX IF NOT EXISTS idx_fingerprints_band3 ON fingerprints (band3);
+"""
+_SQL_INSERT_FINGERPRINT = "INSERT OR IGNORE INTO fingerprints (key, simhash, band0, band1, band2, band3) VALUES (?, ?, ?, ?, ?, ?)"
+_SQL_SELECT_CANDIDATES = "SELECT key, simhash FROM fingerprints WHERE band0 = ? OR band1 = ? OR band2 = ? OR band3 = ?"
+
+# Largest Hamming distance the four bands are guaranteed to find
+_MAX_FUZZY_DISTANCE = 3
+
+# Passages with fewer words are too short for a meaningful fingerprint
+_MIN_FUZZY_WORDS = 8
+
+
+def _simhash(text: str) -> Optional[int]:
+    """Compute the 64-bit SimHash of a passage over its word 3-grams.
+    
+    Args:
+        text: Passage text.
+        
+    Returns:
+        Optional[int]: Unsigned fingerprint, or None if the passage is too short.
+    """
+    words = text.lower().split()
+    if len(words) < _MIN_FUZZY_WORDS:
+        return None
+    
+    # Each fingerprint bit is set when most shingle hashes have it set
+    digests = b"".join(
+        hashlib.blake2b(" ".join(words[i:i + 3]).encode(), digest_size=8).digest()
+        for i in range(len(words) - 2)
+    )
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8), bitorder="little").reshape(-1, 64)
+    majority = bits.sum(axis=0) * 2 > len(bits)
+    return int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+
+
+def _bands(simhash: int) -> Tuple[int, int, int, int]:
+    """Split a fingerprint into its four 16-bit bands.
+    
+    Args:
+        simhash: Unsigned fingerprint.
+        
+    Returns:
+        Tuple[int, int, int, int]: Bands from the lowest bits up.
+    """
+    return tuple(simhash >> shift & 0xFFFF for shift in (0, 16, 32, 48))
+
+
+def _fingerprint_row(key: str, simhash: int) -> Tuple[str, int, int, int, int, int]:
+    """Build the fingerprints row of a passage.
+    
+    Args:
+        key: Cache key of the passage.
+        simhash: Unsigned fingerprint of the passage.
+        
+    Returns:
+        Tuple: (key, signed simhash, band0, band1, band2, band3).
+    """
+    # SQLite integers are signed 64-bit
+    signed = simhash - (1 << 64) if simhash >= 1 << 63 else simhash
+    return (key, signed) + _bands(simhash)
+
+
+class CachedNVIDIAEmbedding(NVIDIAEmbedding):
+    """NVIDIA embedding model that reuses the embeddings of repeated passages.
+    
+    Passage embeddings are keyed by a hash of the model settings and text.
+    They are kept as float16 vectors in a bounded in-process LRU whose
+    entries expire after a TTL, backed by a SQLite store that keeps them
+    across restarts. Only cache misses are sent to the API. Query embeddings are not
+    cached.
+    
+    When enabled with FUZZY_EMBED_THRESHOLD, a passage missing from the
+    cache reuses the embedding of a stored passage whose SimHash is within
+    that many bits, so small edits to a document are not re-embedded. This
+    is lossy: an edit such as a changed number keeps the old embedding.
+    """
+    
+    _cache_path: str = PrivateAttr()
+    _memory: "OrderedDict[str, Tuple[float, np.ndarray]]" = PrivateAttr(default_factory=OrderedDict)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+    _store: Optional[sqlite3.Connection] = PrivateAttr(default=None)
+    
+    def __init__(self, *args: Any, cache_path: Optional[str] = None, **kwargs: Any):
+        """Initialize the cached embedding model.
+        
+        Args:
+            *args: Positional arguments for NVIDIAEmbedding.
+            cache_path: Path to the persistent embedding store.
+            **kwargs: Keyword arguments for NVIDIAEmbedding.
+        """
+        super().__init__(*args, **kwargs)
+        self._cache_path = cache_path or Config.EMBEDDING_CACHE_PATH
+    
+    @classmethod
+    def class_name(cls) -> str:
+        """Get the class name.
+        
+        Returns:
+            str: Class name.
+        """
+        return "CachedNVIDIAEmbedding"
+    
+    def _cache_key(self, text: str) -> str:
+        """Get the cache key of a passage.
+        
+        Args:
+            text: Passage text.
+            
+        Returns:
+            str: Hex digest of the model settings and text.
+        """
+        payload = f"{self.model}\0{self.truncate}\0{text}".encode()
+        return hashlib.blake2b(payload, digest_size=16).hexdigest()
+    
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the persistent store on first use.
+        
+        Must be called with the lock held.
+        
+        Returns:
+            Optional[sqlite3.Connection]: Store connection, or None if it cannot be opened.
+        """
+        if self._store is None:
+            try:
+                store_dir = os.path.dirname(self._cache_path)
+                if store_dir:
+                    os.makedirs(store_dir, exist_ok=True)
+                store = sqlite3.connect(self._cache_path, check_same_thread=False)
+                store.execute("PRAGMA journal_mode=WAL")
+                store.execute("PRAGMA synchronous=NORMAL")
+                store.execute(_SQL_CREATE)
+                store.executescript(_SQL_CREATE_FINGERPRINTS)
+                store.commit()
+                self._store = store
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding cache store unavailable: {str(e)}")
+        return self._store
+    
+    def _lookup(self, keys: List[str]) -> Dict[str, Embedding]:
+        """Get the cached embeddings of passages.
+        
+        Args:
+            keys: Cache keys of the passages.
+            
+        Returns:
+            Dict[str, Embedding]: Embeddings found, by cache key.
+        """
+        found: Dict[str, Embedding] = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._memory.get(key)
+                if entry is not None and now - entry[0] < Config.EMBEDDING_CACHE_TTL_SECONDS:
+                    self._memory.move_to_end(key)
+                    found[key] = entry[1].astype(np.float32).tolist()
+            
+            missing = list({key: None for key in keys if key not in found})
+            store = self._connect() if missing else None
+            if store is None:
+                return found
+            
+            try:
+                rows = store.execute(_SQL_SELECT.format(",".join("?" * len(missing))), missing).fetchall()
+            except sqlite3.Error as e:
+                logger.warning(f"Error reading embedding cache: {str(e)}")
+                return found
+            
+            for key, vector in rows:
+                vector = np.frombuffer(vector, dtype=np.float16)
+                self._memory_put(key, vector, now)
+                found[key] = vector.astype(np.float32).tolist()
+        return found
+    
+    def _memory_put(self, key: str, vector: np.ndarray, now: float) -> None:
+        """Add an embedding to the in-process LRU, evicting the oldest past capacity.
+        
+        Must be called with the lock held.
+        
+        Args:
+            key: Cache key of the passage.
+            vector: Float16 embedding of the passage.
+            now: Current monotonic time.
+        """
+        self._memory[key] = (now, vector)
+        self._memory.move_to_end(key)
+        while len(self._memory) > Config.EMBEDDING_CACHE_SIZE:
+            self._memory.popitem(last=False)
+    
+    def _remember(self, embeddings: Dict[str, Embedding], texts: Optional[Dict[str, str]] = None) -> None:
+        """Cache embeddings in memory and, with their texts, in the persistent store.
+        
+        Embeddings given without texts, such as reused near-duplicates, are
+        only kept in memory, so approximations never seed further matches.
+        
+        Args:
+            embeddings: Embeddings by cache key.
+            texts: Texts of the embedded passages by cache key.
+        """
+        now = time.monotonic()
+        vectors = {key: np.asarray(embedding, dtype=np.float16) for key, embedding in embeddings.items()}
+        with self._lock:
+            for key, vector in vectors.items():
+                self._memory_put(key, vector, now)
+            
+            store = self._connect() if texts else None
+            if store is None:
+                return
+            
+            fingerprints = []
+            if self._fuzzy_enabled():
+                for key, text in texts.items():
+                    simhash = _simhash(text)
+                    if simhash is not None:
+                        fingerprints.append(_fingerprint_row(key, simhash))
+            
+            try:
+                with store:
+                    store.executemany(
+                        _SQL_INSERT,
+                        [(key, vector.tobytes()) for key, vector in vectors.items()]
+                    )
+                    store.executemany(_SQL_INSERT_FINGERPRINT, fingerprints)
+            except sqlite3.Error as e:
+                logger.warning(f"Error writing embedding cache: {str(e)}")
+    
+    @staticmethod
+    def _fuzzy_enabled() -> bool:
+        """Check whether near-duplicate passages may reuse embeddings.
+        
+        Returns:
+            bool: True if fuzzy reuse is enabled.
+        """
+        return 0 < Config.FUZZY_EMBED_THRESHOLD <= _MAX_FUZZY_DISTANCE
+    
+    def _lookup_similar(self, misses: Dict[str, str]) -> Dict[str, Embedding]:
+        """Reuse the embeddings of stored near-duplicates of passages.
+        
+        Args:
+            misses: Texts of passages missing from the cache, by cache key.
+            
+        Returns:
+            Dict[str, Embedding]: Reused embeddings, by cache key of the passage.
+        """
+        if not self._fuzzy_enabled():
+            return {}
+        
+        matches: Dict[str, str] = {}
+        with self._lock:
+            store = self._connect()
+            if store is None:
+                return {}
+            
+            for key, text in misses.items():
+                simhash = _simhash(text)
+                if simhash is None:
+                    continue
+                
+                try:
+                    candidates = store.execute(_SQL_SELECT_CANDIDATES, _bands(simhash)).fetchall()
+                except sqlite3.Error as e:
+                    logger.warning(f"Error reading embedding fingerprints: {str(e)}")
+                    return {}
+                
+                best = Config.FUZZY_EMBED_THRESHOLD + 1
+                for candidate_key, candidate_hash in candidates:
+                    distance = bin((candidate_hash & 0xFFFFFFFFFFFFFFFF) ^ simhash).count("1")
+                    if distance < best:
+                        best = distance
+                        matches[key] = candidate_key
+        
+        if not matches:
+            return {}
+        
+        found = self._lookup(list(matches.values()))
+        reused = {key: found[match] for key, match in matches.items() if match in found}
+        if reused:
+            logger.debug("Reused embeddings of %d near-duplicate passages", len(reused))
+            self._remember(reused)
+        return reused
+    
+    def _resolve(self, texts: List[str]) -> Tuple[List[str], Dict[str, Embedding], List[List[Tuple[str, str]]]]:
+        """Resolve passages from the cache and batch the rest for the API.
+        
+        Args:
+            texts: Passage texts.
+            
+        Returns:
+            Tuple: (cache key of each passage, embeddings found by cache key,
+            batches of (cache key, text) misses of at most embed_batch_size).
+        """
+        keys = [self._cache_key(text) for text in texts]
+        found = self._lookup(keys)
+        misses = {key: text for key, text in zip(keys, texts) if key not in found}
+        if misses:
+            for key, embedding in self._lookup_similar(misses).items():
+                found[key] = embedding
+                del misses[key]
+        
+        pending = list(misses.items())
+        size = max(1, self.embed_batch_size)
+        return keys, found, [pending[i:i + size] for i in range(0, len(pending), size)]
+    
+    def _store_batch(self, batch: List[Tuple[str, str]], embeddings: List[Embedding],
+                     found: Dict[str, Embedding]) -> None:
+        """Cache the embeddings the API returned for a batch of passages.
+        
+        Args:
+            batch: (cache key, text) of the embedded passages.
+            embeddings: Embeddings returned for the batch.
+            found: Embeddings by cache key, updated in place.
+        """
+        computed = {key: embedding for (key, _), embedding in zip(batch, embeddings)}
+        self._remember(computed, dict(batch))
+        found.update(computed)
+    
+    def _get_text_embedding(self, text: str) -> Embedding:
+        """Embed a passage, reusing its cached embedding if any."""
+        return self._get_text_embeddings([text])[0]
+    
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        """Embed passages, sending cache misses to the API in embed_batch_size requests."""
+        keys, found, batches = self._resolve(texts)
+        for batch in batches:
+            embeddings = super()._get_text_embeddings([text for _, text in batch])
+            self._store_batch(batch, embeddings, found)
+        return [found[key] for key in keys]
+    
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        """Asynchronously embed a passage, reusing its cached embedding if any."""
+        return (await self._aget_text_embeddings([text]))[0]
+    
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        """Asynchronously embed passages, sending cache misses in embed_batch_size requests."""
+        keys, found, batches = self._resolve(texts)
+        for batch in batches:
+            embeddings = await super()._aget_text_embeddings([text for _, text in batch])
+            self._store_batch(batch, embeddings, found)
+        return [found[key] for key in keys]
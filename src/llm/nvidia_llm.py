@@ -1,15 +1,74 @@
 """NVIDIA LLM integration."""
 
+import functools
+import threading
 from typing import Optional
 
+import httpx
 from llama_index.core import Settings
+from llama_index.core.node_parser.text.sentence import SENTENCE_CHUNK_OVERLAP
 from llama_index.embeddings.nvidia import NVIDIAEmbedding
 from llama_index.llms.nvidia import NVIDIA
 
+from src.document_processing.processor import get_text_splitter
+from src.llm.cached_embedding import CachedNVIDIAEmbedding
 from src.utils.logger import logger
 from src.utils.config import Config
 
 
+def _async_http_client() -> httpx.AsyncClient:
+    """Create the pooled HTTP client for asynchronous LLM requests.
+    
+    Responses stream through aquery, so the async client carries the
+    request path; connecting fails fast while streaming may take longer.
+    
+    Returns:
+        httpx.AsyncClient: HTTP client for the LLM.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(Config.LLM_TIMEOUT_SECONDS, connect=Config.LLM_CONNECT_TIMEOUT_SECONDS)
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _embedding_model() -> CachedNVIDIAEmbedding:
+    """Build the NVIDIA embedding model once per process.
+    
+    Returns:
+        CachedNVIDIAEmbedding: NVIDIA embedding model.
+    """
+    return CachedNVIDIAEmbedding(
+        Config.EMBEDDING_MODEL,
+        truncate="END",
+        embed_batch_size=Config.EMBED_BATCH_SIZE
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _llm() -> NVIDIA:
+    """Build the NVIDIA LLM once per process.
+    
+    Returns:
+        NVIDIA: NVIDIA LLM.
+    """
+    return NVIDIA(model=Config.LLM_MODEL, async_http_client=_async_http_client())
+
+
+def _warm_up(embed_model: NVIDIAEmbedding) -> None:
+    """Open the embedding client's connection before the first user request.
+    
+    A query embedding is used, so nothing is written to the passage cache.
+    
+    Args:
+        embed_model: Embedding model to warm up.
+    """
+    try:
+        embed_model.get_query_embedding("warmup")
+        logger.info("Warmed up embedding model.")
+    except Exception as e:
+        logger.warning(f"Error warming up embedding model: {str(e)}")
+
+
 def configure_llm_settings() -> None:
     """Configure LlamaIndex settings for NVIDIA LLM."""
     try:
@@ -20,14 +79,17 @@ def configure_llm_settings() -> None:
             raise ValueError(error_msg)
         
         # Configure settings
-        from llama_index.core.node_parser import SentenceSplitter
+        Settings.text_splitter = get_text_splitter(500, SENTENCE_CHUNK_OVERLAP)
+        Settings.embed_model = _embedding_model()
+        Settings.llm = _llm()
         
-        Settings.text_splitter = SentenceSplitter(chunk_size=500)
-        Settings.embed_model = NVIDIAEmbedding(
-            Config.EMBEDDING_MODEL,
-            truncate="END"
-        )
-        Settings.llm = NVIDIA(model=Config.LLM_MODEL)
+        # Pay the connection setup in the background rather than on the first query
+        threading.Thread(
+            target=_warm_up,
+            args=(Settings.embed_model,),
+            name="embedding-warmup",
+            daemon=True
+        ).start()
         
         logger.info("Successfully configured LLM settings.")
     except Exception as e:
@@ -36,31 +98,26 @@ def configure_llm_settings() -> None:
 
 
 def get_embedding_model() -> Optional[NVIDIAEmbedding]:
-    """Get the NVIDIA embedding model.
+    """Get the NVIDIA embedding model shared by the process.
     
     Returns:
         Optional[NVIDIAEmbedding]: NVIDIA embedding model.
     """
     try:
-        embed_model = NVIDIAEmbedding(
-            Config.EMBEDDING_MODEL,
-            truncate="END"
-        )
-        return embed_model
+        return _embedding_model()
     except Exception as e:
         logger.error(f"Error initializing embedding model: {str(e)}")
         return None
 
 
 def get_llm() -> Optional[NVIDIA]:
-    """Get the NVIDIA LLM.
+    """Get the NVIDIA LLM shared by the process.
     
     Returns:
         Optional[NVIDIA]: NVIDIA LLM.
     """
     try:
-        llm = NVIDIA(model=Config.LLM_MODEL)
-        return llm
+        return _llm()
     except Exception as e:
         logger.error(f"Error initializing LLM: {str(e)}")
         return None
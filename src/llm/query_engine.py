@@ -1,22 +1,64 @@
 """Query processing utilities."""
 
-import time
+import asyncio
+import functools
 from threading import Thread
-from typing import Iterator, Optional, Callable
+from typing import AsyncIterator, Iterator, List, Optional, Callable
 
 import streamlit as st
+from llama_index.core import QueryBundle, Settings
+from llama_index.core.base.response.schema import AsyncStreamingResponse, StreamingResponse
 
-from src.utils.logger import logger
+from src.auth.auth_manager import get_auth_manager
+from src.utils.logger import log_activity, logger
 from src.utils.config import Config
 from src.document_processing.indexer import DocumentIndexer
+from src.vector_store.milvus import get_semantic_cache
 
+# Tokens coalesced into each chunk written to the UI
+TOKENS_PER_UPDATE = 4
 
-def stream_response(query_engine, message: str) -> Iterator[str]:
-    """Stream a response from the query engine.
+# Returned by next() once a synchronous token generator is exhausted
+_END = object()
+
+
+@functools.lru_cache(maxsize=None)
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Start the event loop running all LLM requests of the process.
+    
+    Responses of every browser session stream on this one loop, sharing
+    the LLM's async HTTP connection pool instead of a thread per request.
+    
+    Returns:
+        asyncio.AbstractEventLoop: Running background event loop.
+    """
+    loop = asyncio.new_event_loop()
+    Thread(target=loop.run_forever, name="llm-event-loop", daemon=True).start()
+    return loop
+
+
+@functools.lru_cache(maxsize=256)
+def _query_embedding(message: str) -> List[float]:
+    """Embed a query, reusing the embedding when the same text is asked again.
+    
+    Args:
+        message: User message to embed.
+        
+    Returns:
+        List[float]: Query embedding.
+    """
+    return Settings.embed_model.get_query_embedding(message)
+
+
+async def astream_response(query_engine, message: str, embedding: Optional[List[float]] = None,
+                           on_complete: Optional[Callable[[str], None]] = None) -> AsyncIterator[str]:
+    """Asynchronously stream a response from the query engine.
     
     Args:
         query_engine: Query engine to use.
         message: User message to respond to.
+        embedding: Precomputed query embedding, used for retrieval if given.
+        on_complete: Called with the full response once it streamed without error.
         
     Yields:
         str: Chunks of the response.
@@ -25,66 +67,91 @@ def stream_response(query_engine, message: str) -> Iterator[str]:
         yield "Please load documents first."
         return
     
+    chunks = []
     try:
-        response = query_engine.query(message)
-        for text in response.response_gen:
+        query = QueryBundle(message, embedding=embedding) if embedding is not None else message
+        response = await query_engine.aquery(query)
+        if isinstance(response, AsyncStreamingResponse):
+            async for text in response.async_response_gen():
+                chunks.append(text)
+                yield text
+        elif isinstance(response, StreamingResponse):
+            # Each token is awaited in a worker thread, so a synchronous
+            # generator doesn't block the other sessions on the shared loop
+            loop = asyncio.get_running_loop()
+            tokens = iter(response.response_gen)
+            while (text := await loop.run_in_executor(None, next, tokens, _END)) is not _END:
+                chunks.append(text)
+                yield text
+        else:
+            # Non-streaming engines return the whole response at once
+            text = str(response)
+            chunks.append(text)
             yield text
     except Exception as e:
         logger.error(f"Error generating response: {str(e)}")
         yield f"Error generating response: {str(e)}"
+        return
+    
+    if on_complete:
+        on_complete("".join(chunks))
 
 
-def process_query_in_thread(query_engine, message: str, callback: Optional[Callable] = None) -> None:
-    """Process a query in a separate thread to allow for streaming responses.
+def stream_response(query_engine, message: str, embedding: Optional[List[float]] = None,
+                    on_complete: Optional[Callable[[str], None]] = None) -> Iterator[str]:
+    """Stream a response from the query engine.
+    
+    The response is produced by astream_response on the shared event loop;
+    the calling thread only waits for each chunk.
     
     Args:
         query_engine: Query engine to use.
         message: User message to respond to.
-        callback: Optional callback function to call when response is complete.
+        embedding: Precomputed query embedding, used for retrieval if given.
+        on_complete: Called with the full response once it streamed without error.
+        
+    Yields:
+        str: Chunks of the response.
     """
-    # Initialize or reset session state for streaming
-    st.session_state.partial_response = ""
-    st.session_state.response_completed = False
-    
-    def update_response():
-        """Update the response in session state as it is generated."""
-        full_response = ""
-        try:
-            for text in stream_response(query_engine, message):
-                st.session_state.partial_response += text
-                full_response += text
-                time.sleep(0.01)  # Small delay to allow for UI updates
-            
-            # Store in database if available
-            from src.auth.auth_manager import get_auth_manager
-            auth_manager = get_auth_manager()
-            if auth_manager.db and st.session_state.get("authenticated", False):
-                auth_manager.db.store_chat_history(
-                    st.session_state.current_user,
-                    st.session_state.session_id,
-                    message,
-                    full_response
-                )
-            
-            # Log activity
-            if st.session_state.get("authenticated", False):
-                from src.utils.logger import log_activity
-                log_activity(
-                    st.session_state.current_user,
-                    "query",
-                    f"Query: {message[:50]}..."
-                )
-        except Exception as e:
-            logger.error(f"Error in query thread: {str(e)}")
-        finally:
-            st.session_state.response_completed = True
-            if callback:
-                callback(full_response)
+    loop = _event_loop()
+    chunks = astream_response(query_engine, message, embedding, on_complete)
+    try:
+        while True:
+            try:
+                yield asyncio.run_coroutine_threadsafe(chunks.__anext__(), loop).result()
+            except StopAsyncIteration:
+                return
+    finally:
+        asyncio.run_coroutine_threadsafe(chunks.aclose(), loop).result()
+
+
+def record_query(message: str, response: str) -> None:
+    """Store a completed query and its response, and log the query.
     
-    # Start thread for streaming response
-    thread = Thread(target=update_response)
-    thread.daemon = True  # Thread will die when main program exits
-    thread.start()
+    Args:
+        message: User message that was answered.
+        response: Full response to the message.
+    """
+    try:
+        # Store in database if available
+        auth_manager = get_auth_manager()
+        if auth_manager.db and st.session_state.get("authenticated", False):
+            auth_manager.db.store_chat_history(
+                st.session_state.current_user,
+                st.session_state.session_id,
+                message,
+                response
+            )
+        
+        # Log activity
+        if st.session_state.get("authenticated", False):
+            log_activity(
+                st.session_state.current_user,
+                "query",
+                f"Query: {message[:50]}..."
+            )
+    except Exception as e:
+        logger.error(f"Error recording query: {str(e)}")
 
 
 class QueryProcessor:
@@ -98,22 +165,64 @@ class QueryProcessor:
         """
         self.query_engine = query_engine
     
-    def process_query(self, message: str, callback: Optional[Callable] = None) -> None:
-        """Process a user query.
+    def process_query(self, message: str, callback: Optional[Callable] = None) -> Iterator[str]:
+        """Stream the response to a user query.
+        
+        A cached response to a similar earlier query is yielded whole;
+        otherwise response tokens are yielded TOKENS_PER_UPDATE at a time.
+        Once the stream is exhausted, the query is recorded and the callback
+        is called with the full response.
         
         Args:
             message: User message to respond to.
             callback: Optional callback function to call when response is complete.
+            
+        Yields:
+            str: Chunks of the response.
         """
         if not self.query_engine:
             logger.warning("No query engine available.")
-            st.session_state.partial_response = "Please load documents first."
-            st.session_state.response_completed = True
+            yield "Please load documents first."
             if callback:
                 callback("Please load documents first.")
             return
         
-        process_query_in_thread(self.query_engine, message, callback)
+        # Similar questions are answered from the cache, skipping retrieval
+        # and generation; the embedding is reused for retrieval on a miss
+        cache = get_semantic_cache(self.query_engine)
+        try:
+            embedding = _query_embedding(message)
+        except Exception as e:
+            logger.error(f"Error embedding query: {str(e)}")
+            embedding = None
+        
+        cached_response = cache.lookup(embedding) if embedding is not None else None
+        if cached_response is not None:
+            yield cached_response
+            record_query(message, cached_response)
+            if callback:
+                callback(cached_response)
+            return
+        
+        on_complete = functools.partial(cache.add, embedding) if embedding is not None else None
+        
+        # Tokens are passed on in groups, so the browser gets one update per
+        # TOKENS_PER_UPDATE tokens instead of one per token
+        chunks = []
+        pending = 0
+        for text in stream_response(self.query_engine, message, embedding, on_complete):
+            chunks.append(text)
+            pending += 1
+            if pending == TOKENS_PER_UPDATE:
+                yield "".join(chunks[-pending:])
+                pending = 0
+        if pending:
+            yield "".join(chunks[-pending:])
+        
+        full_response = "".join(chunks)
+        record_query(message, full_response)
+        if callback:
+            callback(full_response)
     
     def set_query_engine(self, query_engine) -> None:
         """Set the query engine.
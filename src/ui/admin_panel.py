@@ -1,9 +1,11 @@
 """Admin panel user interface."""
 
+import pandas as pd
 import streamlit as st
 
 from src.utils.logger import log_activity, get_activity_logs
 from src.auth.auth_manager import get_auth_manager
+from src.vector_store.milvus import rebuild_vector_store
 
 
 def admin_ui() -> None:
@@ -13,7 +15,7 @@ def admin_ui() -> None:
     # Return to main app button
     if st.button("Return to Chat"):
         st.session_state.admin_view = False
-        st.experimental_rerun()
+        st.rerun()
     
     tab1, tab2, tab3 = st.tabs(["User Management", "Activity Logs", "System Settings"])
     
@@ -53,57 +55,73 @@ def user_management_tab() -> None:
             else:
                 st.error("Username and password are required.")
     
+    _users_fragment(auth_manager)
+
+
+@st.fragment
+def _users_fragment(auth_manager) -> None:
+    """Render the current users table.
+    
+    Runs as a fragment, so deleting a user reruns only this table.
+    
+    Args:
+        auth_manager: Authentication manager.
+    """
     st.subheader("Current Users")
     
     users = auth_manager.user_manager.get_all_users()
     
-    for username, user in users.items():
-        col1, col2, col3 = st.columns([3, 2, 1])
+    # One column per field, rendered as a single table
+    st.dataframe(
+        pd.DataFrame({
+            "Username": list(users),
+            "Admin": [user.is_admin for user in users.values()],
+            "Last login": [
+                user.last_login.strftime("%Y-%m-%d %H:%M") if user.last_login else "Never"
+                for user in users.values()
+            ],
+        }),
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    # Prevent deleting yourself
+    deletable = [username for username in users if username != st.session_state.current_user]
+    if deletable:
+        col1, col2 = st.columns([3, 1])
         with col1:
-            st.write(f"**{username}**" + (" (Admin)" if user.is_admin else ""))
+            username = st.selectbox("User to delete", deletable, label_visibility="collapsed")
         with col2:
-            last_login = user.last_login
-            if last_login:
-                if isinstance(last_login, str):
-                    try:
-                        from datetime import datetime
-                        last_login = datetime.fromisoformat(last_login).strftime("%Y-%m-%d %H:%M")
-                    except:
-                        pass  # Keep as is if parsing fails
-                else:
-                    last_login = last_login.strftime("%Y-%m-%d %H:%M")
-            else:
-                last_login = "Never"
-                
-            st.write(f"Last login: {last_login}")
-        with col3:
-            if username != st.session_state.current_user:  # Prevent deleting yourself
-                if st.button("Delete", key=f"del_{username}"):
-                    auth_manager.user_manager.delete_user(username)
-                    log_activity(
-                        st.session_state.current_user,
-                        "delete_user",
-                        f"Deleted user: {username}"
-                    )
-                    st.experimental_rerun()
+            if st.button("Delete User"):
+                auth_manager.user_manager.delete_user(username)
+                log_activity(
+                    st.session_state.current_user,
+                    "delete_user",
+                    f"Deleted user: {username}"
+                )
+                st.rerun(scope="fragment")
 
 
+@st.fragment
 def activity_logs_tab() -> None:
-    """Render the activity logs tab."""
+    """Render the activity logs tab.
+    
+    Runs as a fragment, so refreshing the logs reruns only this tab.
+    """
     st.subheader("User Activity Logs")
+    st.button("Refresh Logs")
     
     logs = get_activity_logs(100)  # Get last 100 logs
     
     if logs:
-        for log in logs:
-            try:
-                from datetime import datetime
-                timestamp = datetime.fromisoformat(log["timestamp"]).strftime("%Y-%m-%d %H:%M:%S")
-            except:
-                timestamp = log["timestamp"]
-            
-            st.write(f"**{timestamp}** - {log['username']} - {log['activity']}" + 
-                     (f" - {log['details']}" if log.get('details') else ""))
+        # Format all timestamps in one pass, keeping unparsable ones as stored
+        df = pd.DataFrame(logs).reindex(columns=["timestamp", "username", "activity", "details"])
+        df["timestamp"] = (
+            pd.to_datetime(df["timestamp"], format="ISO8601", errors="coerce")
+            .dt.strftime("%Y-%m-%d %H:%M:%S")
+            .fillna(df["timestamp"])
+        )
+        st.dataframe(df, use_container_width=True, hide_index=True)
     else:
         st.info("No activity logs found.")
 
@@ -123,3 +141,13 @@ def system_settings_tab() -> None:
             f"Removed {count} expired sessions"
         )
         st.success(f"Removed {count} expired sessions.")
+    
+    # Drop every indexed document from the shared collection
+    if st.button("Rebuild Vector Index"):
+        rebuild_vector_store()
+        log_activity(
+            st.session_state.current_user,
+            "rebuild_index",
+            "Recreated the vector store collection"
+        )
+        st.success("Vector index cleared. Upload documents to rebuild it.")
@@ -1,6 +1,6 @@
 """Login user interface."""
 
-from datetime import datetime, timedelta
+import time
 
 import streamlit as st
 
@@ -12,18 +12,18 @@ def login_ui() -> None:
     """Render the login interface."""
     st.title("RAG Q&A Chat Application - Login")
     
-    # Check for lockout
-    if "lockout_until" in st.session_state and st.session_state.lockout_until:
-        if datetime.now() < st.session_state.lockout_until:
-            remaining = (st.session_state.lockout_until - datetime.now()).seconds // 60
+    # Check for lockout; one float comparison while no lockout is set
+    lockout_until_ts = st.session_state.get("lockout_until_ts", 0.0)
+    if lockout_until_ts:
+        now = time.time()
+        if now < lockout_until_ts:
+            remaining = int(lockout_until_ts - now) // 60
             st.error(f"Too many failed login attempts. Please try again in {remaining} minutes.")
             return
-    
-    # Reset lockout if expired
-    if "lockout_until" in st.session_state and st.session_state.lockout_until:
-        if datetime.now() >= st.session_state.lockout_until:
-            st.session_state.lockout_until = None
-            st.session_state.login_attempts = 0
+        
+        # Reset lockout once expired
+        st.session_state.lockout_until_ts = 0.0
+        st.session_state.login_attempts = 0
     
     # Initialize login attempts counter if not present
     if "login_attempts" not in st.session_state:
@@ -37,11 +37,11 @@ def login_ui() -> None:
         if submit:
             if authenticate_user(username, password):
                 st.success("Login successful!")
-                st.experimental_rerun()
+                st.rerun()
             else:
                 st.session_state.login_attempts += 1
                 if st.session_state.login_attempts >= Config.MAX_LOGIN_ATTEMPTS:
-                    st.session_state.lockout_until = datetime.now() + timedelta(minutes=Config.IP_COOLDOWN_MINUTES)
+                    st.session_state.lockout_until_ts = time.time() + Config.IP_COOLDOWN_MINUTES * 60
                     st.error(f"Too many failed login attempts. Your access has been locked for {Config.IP_COOLDOWN_MINUTES} minutes.")
                 else:
                     st.error(f"Invalid username or password. Attempts remaining: {Config.MAX_LOGIN_ATTEMPTS - st.session_state.login_attempts}")
@@ -1,11 +1,12 @@
 """Sidebar user interface components."""
 
+import os
 from typing import List
 
 import streamlit as st
 
 from src.utils.logger import log_activity
-from src.auth.auth_manager import logout_user
+from src.auth.auth_manager import get_auth_manager, logout_user
 from src.document_processing.loader import DocumentLoader
 from src.document_processing.processor import DocumentProcessor
 from src.document_processing.indexer import DocumentIndexer
@@ -23,13 +24,13 @@ def render_sidebar() -> List:
         # Logout button
         if st.button("Logout"):
             logout_user()
-            st.experimental_rerun()
+            st.rerun()
         
         # Admin panel button
         if st.session_state.admin_mode:
             if st.button("Admin Panel"):
                 st.session_state.admin_view = True
-                st.experimental_rerun()
+                st.rerun()
         
         # Document upload
         st.header("📄 Document Upload")
@@ -74,6 +75,23 @@ def render_sidebar() -> List:
                 query_processor = get_query_processor()
                 query_processor.set_query_engine(query_engine)
                 
+                # Record metadata for every saved file in one write
+                auth_manager = get_auth_manager()
+                if auth_manager.db:
+                    saved_paths = set(file_paths)
+                    rows = []
+                    for uploaded_file in uploaded_files:
+                        file_path = os.path.join(loader.temp_dir, uploaded_file.name)
+                        if file_path in saved_paths:
+                            rows.append((
+                                st.session_state.current_user,
+                                uploaded_file.name,
+                                file_path,
+                                uploaded_file.size,
+                                uploaded_file.type or ""
+                            ))
+                    auth_manager.db.store_documents_bulk(rows)
+                
                 # Log activity
                 log_activity(
                     st.session_state.current_user,
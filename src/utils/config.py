@@ -19,24 +19,52 @@ class Config:
     SESSION_EXPIRY_MINUTES = int(os.getenv("SESSION_EXPIRY_MINUTES", "30"))
     MAX_LOGIN_ATTEMPTS = int(os.getenv("MAX_LOGIN_ATTEMPTS", "5"))
     IP_COOLDOWN_MINUTES = int(os.getenv("IP_COOLDOWN_MINUTES", "15"))
+    SESSION_CLEANUP_INTERVAL_SECONDS = int(os.getenv("SESSION_CLEANUP_INTERVAL_SECONDS", "60"))
+    USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
     
     # Database settings
     DB_TYPE = os.getenv("DB_TYPE", "sqlite").lower()
     SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "db/qnachat.db")
+    SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "5"))
+    SQLITE_POOL_TIMEOUT = float(os.getenv("SQLITE_POOL_TIMEOUT", "30"))
+    SQLITE_POOL_RECYCLE = int(os.getenv("SQLITE_POOL_RECYCLE", "3600"))
     MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017/")
     MONGODB_DB = os.getenv("MONGODB_DB", "qnachat")
     
     # File paths
     USER_CONFIG_PATH = "users.yaml"
+    SESSIONS_JSON_PATH = "sessions.json"
     USER_ACTIVITY_LOG_PATH = "user_activity.json"
+    # The activity log rotates past this size, keeping this many older segments (0 disables rotation)
+    USER_ACTIVITY_LOG_MAX_BYTES = int(os.getenv("USER_ACTIVITY_LOG_MAX_BYTES", str(8 * 1024 * 1024)))
+    USER_ACTIVITY_LOG_BACKUPS = int(os.getenv("USER_ACTIVITY_LOG_BACKUPS", "5"))
+    
+    # Document loading and processing settings
+    DOCUMENT_LOAD_WORKERS = max(1, int(os.getenv("DOCUMENT_LOAD_WORKERS", str(min(8, os.cpu_count() or 1)))))
+    CHUNK_WORKERS = max(1, int(os.getenv("CHUNK_WORKERS", str(os.cpu_count() or 1))))
     
     # LLM settings
     EMBEDDING_MODEL = "NV-Embed-QA"
     LLM_MODEL = "meta/llama-3.1-405b-instruct"
+    LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_CONNECT_TIMEOUT_SECONDS = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+    EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "128"))
+    EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", "db/embedding_cache.db")
+    EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+    EMBEDDING_CACHE_TTL_SECONDS = int(os.getenv("EMBEDDING_CACHE_TTL_SECONDS", "3600"))
+    # Largest SimHash distance (1-3) at which a passage reuses a stored embedding; 0 disables
+    FUZZY_EMBED_THRESHOLD = int(os.getenv("FUZZY_EMBED_THRESHOLD", "0"))
     
     # Vector store settings
     VECTOR_STORE_PATH = "./milvus_demo.db"
     EMBEDDING_DIMENSION = 1024
+    VECTOR_INSERT_BATCH_SIZE = int(os.getenv("VECTOR_INSERT_BATCH_SIZE", "2048"))
+    # Responses cached for similar repeat questions; 0 disables the cache. Off by
+    # default: questions that differ only in an entity, a year or a negation can
+    # still pass the similarity threshold and get the other question's answer.
+    SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "0"))
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92"))
+    SEMANTIC_CACHE_TTL_SECONDS = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
     
     @classmethod
     def validate(cls) -> Optional[str]:
@@ -66,14 +94,35 @@ class Config:
             "session_expiry_minutes": cls.SESSION_EXPIRY_MINUTES,
             "max_login_attempts": cls.MAX_LOGIN_ATTEMPTS,
             "ip_cooldown_minutes": cls.IP_COOLDOWN_MINUTES,
+            "session_cleanup_interval_seconds": cls.SESSION_CLEANUP_INTERVAL_SECONDS,
+            "user_cache_ttl_seconds": cls.USER_CACHE_TTL_SECONDS,
             "db_type": cls.DB_TYPE,
             "sqlite_db_path": cls.SQLITE_DB_PATH,
+            "sqlite_pool_size": cls.SQLITE_POOL_SIZE,
+            "sqlite_pool_timeout": cls.SQLITE_POOL_TIMEOUT,
+            "sqlite_pool_recycle": cls.SQLITE_POOL_RECYCLE,
             "mongodb_uri": cls.MONGODB_URI,
             "mongodb_db": cls.MONGODB_DB,
             "user_config_path": cls.USER_CONFIG_PATH,
+            "sessions_json_path": cls.SESSIONS_JSON_PATH,
             "user_activity_log_path": cls.USER_ACTIVITY_LOG_PATH,
+            "user_activity_log_max_bytes": cls.USER_ACTIVITY_LOG_MAX_BYTES,
+            "user_activity_log_backups": cls.USER_ACTIVITY_LOG_BACKUPS,
+            "document_load_workers": cls.DOCUMENT_LOAD_WORKERS,
+            "chunk_workers": cls.CHUNK_WORKERS,
             "embedding_model": cls.EMBEDDING_MODEL,
             "llm_model": cls.LLM_MODEL,
+            "llm_timeout_seconds": cls.LLM_TIMEOUT_SECONDS,
+            "llm_connect_timeout_seconds": cls.LLM_CONNECT_TIMEOUT_SECONDS,
+            "embed_batch_size": cls.EMBED_BATCH_SIZE,
+            "embedding_cache_path": cls.EMBEDDING_CACHE_PATH,
+            "embedding_cache_size": cls.EMBEDDING_CACHE_SIZE,
+            "embedding_cache_ttl_seconds": cls.EMBEDDING_CACHE_TTL_SECONDS,
+            "fuzzy_embed_threshold": cls.FUZZY_EMBED_THRESHOLD,
             "vector_store_path": cls.VECTOR_STORE_PATH,
-            "embedding_dimension": cls.EMBEDDING_DIMENSION
+            "embedding_dimension": cls.EMBEDDING_DIMENSION,
+            "vector_insert_batch_size": cls.VECTOR_INSERT_BATCH_SIZE,
+            "semantic_cache_size": cls.SEMANTIC_CACHE_SIZE,
+            "semantic_cache_threshold": cls.SEMANTIC_CACHE_THRESHOLD,
+            "semantic_cache_ttl_seconds": cls.SEMANTIC_CACHE_TTL_SECONDS
         }
@@ -0,0 +1,133 @@
+"""Cached loading of file-based configuration stores."""
+
+import os
+from typing import Any, Callable, Dict, IO, Optional, Tuple
+
+import orjson
+import yaml
+
+# Prefer the libyaml C bindings when PyYAML was built with them
+_YAML_BASE_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+
+class _YAMLLoader(_YAML_BASE_LOADER):
+    """Safe loader that keeps timestamps as the ISO strings they were written as."""
+
+
+_YAMLLoader.yaml_implicit_resolvers = {
+    first: [(tag, regexp) for tag, regexp in resolvers if tag != "tag:yaml.org,2002:timestamp"]
+    for first, resolvers in _YAML_BASE_LOADER.yaml_implicit_resolvers.items()
+}
+
+# Parsed file contents keyed by path, tagged with the (mtime_ns, size) they were read at
+_FILE_CACHE: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """Get the modification signature of a file.
+    
+    Args:
+        path: Path to the file.
+    
+    Returns:
+        Optional[Tuple[int, int]]: (mtime in ns, size) or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _load_cached(path: str, mode: str, parse: Callable[[IO], Any]) -> Any:
+    """Load a file, reusing the parsed data while the file is unchanged.
+    
+    Args:
+        path: Path to the file.
+        mode: Mode to open the file with.
+        parse: Function parsing the open file.
+    
+    Returns:
+        Any: Parsed data, or None if the file does not exist or is empty.
+    """
+    signature = _file_signature(path)
+    if signature is None or signature[1] == 0:
+        _FILE_CACHE.pop(path, None)
+        return None
+    
+    cached = _FILE_CACHE.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    
+    with open(path, mode) as file:
+        data = parse(file)
+    
+    _FILE_CACHE[path] = (signature, data)
+    return data
+
+
+def _remember(path: str, data: Any) -> None:
+    """Refresh the cached copy of a file that was just written.
+    
+    Args:
+        path: Path to the file.
+        data: Data the file now contains.
+    """
+    signature = _file_signature(path)
+    if signature is not None:
+        _FILE_CACHE[path] = (signature, data)
+
+
+def load_yaml(path: str) -> Any:
+    """Load a YAML file, reusing the parsed data while the file is unchanged.
+    
+    The returned object is shared with later callers, so it must only be
+    mutated when the result is written back with save_yaml().
+    
+    Args:
+        path: Path to the YAML file.
+    
+    Returns:
+        Any: Parsed data, or None if the file does not exist or is empty.
+    """
+    return _load_cached(path, 'r', lambda file: yaml.load(file, Loader=_YAMLLoader))
+
+
+def save_yaml(path: str, data: Any) -> None:
+    """Write data to a YAML file and refresh the cached copy.
+    
+    Args:
+        path: Path to the YAML file.
+        data: Data to serialize.
+    """
+    with open(path, 'w') as file:
+        yaml.dump(data, file, Dumper=_YAML_DUMPER)
+    _remember(path, data)
+
+
+def load_json(path: str) -> Any:
+    """Load a JSON file, reusing the parsed data while the file is unchanged.
+    
+    The returned object is shared with later callers, so it must only be
+    mutated when the result is written back with save_json().
+    
+    Args:
+        path: Path to the JSON file.
+    
+    Returns:
+        Any: Parsed data, or None if the file does not exist or is empty.
+    """
+    return _load_cached(path, 'rb', lambda file: orjson.loads(file.read()))
+
+
+def save_json(path: str, data: Any) -> None:
+    """Write data to a JSON file and refresh the cached copy.
+    
+    Args:
+        path: Path to the JSON file.
+        data: Data to serialize.
+    """
+    with open(path, 'wb') as file:
+        file.write(orjson.dumps(data))
+    _remember(path, data)
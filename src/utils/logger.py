@@ -1,13 +1,23 @@
 """Logging utilities for the application."""
 
-import json
+import atexit
+import collections
+import contextlib
+import gc
 import logging
 import os
+import queue
+import shutil
+import threading
+import time
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
 
+import orjson
 import streamlit as st
 
+from src.utils.config import Config
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -19,46 +29,294 @@ logging.basicConfig(
 
 logger = logging.getLogger("nvidia-rag-chatbot")
 
+# Resolved once; the configured path does not change at runtime
+_LOG_PATH = Config.USER_ACTIVITY_LOG_PATH
+
+# The active log file is rotated once it reaches _LOG_MAX_BYTES, keeping
+# _LOG_BACKUP_COUNT older segments as <path>.1 (newest) to <path>.N; with
+# no backups the log is never rotated, as rotating would discard it
+_LOG_MAX_BYTES = Config.USER_ACTIVITY_LOG_MAX_BYTES
+_LOG_BACKUP_COUNT = max(0, Config.USER_ACTIVITY_LOG_BACKUPS)
+
+# Newest activity entries kept in each session for real-time tracking
+_SESSION_LOG_SIZE = 500
+
+# Activity entries waiting for the background writer
+_log_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=10000)
+
+# Entries are written in batches of up to _LOG_BATCH_SIZE, at most
+# _LOG_FLUSH_SECONDS after the first of them was queued
+_LOG_BATCH_SIZE = 256
+_LOG_FLUSH_SECONDS = 1.0
+
+# Queued by the exit hook to stop the writer after the entries before it
+_LOG_STOP: Any = object()
+_LOG_EXIT_TIMEOUT_SECONDS = 5.0
+
+# Reads walk the log file backwards in blocks of this size
+_LOG_READ_BLOCK_SIZE = 1 << 16
+
+# Serializes the writer thread's appends with legacy log conversion on read
+_log_file_lock = threading.Lock()
+
+# Nesting depth of _gc_paused across threads, and the collector state it restores
+_gc_pause_lock = threading.Lock()
+_gc_pause_depth = 0
+_gc_was_enabled = True
+
+# Whether the log file was checked for the legacy JSON array format
+_legacy_checked = False
+
+
+@contextlib.contextmanager
+def _gc_paused() -> Iterator[None]:
+    """Pause cyclic garbage collection while decoding many log entries.
+    
+    Decoding allocates a dict per entry and no cycles, so collections
+    triggered meanwhile would only rescan them. The pause is shared by
+    overlapping callers on other threads and lifted when the last one
+    leaves, restoring whether collection was enabled.
+    """
+    global _gc_pause_depth, _gc_was_enabled
+    with _gc_pause_lock:
+        if _gc_pause_depth == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pause_depth += 1
+    try:
+        yield
+    finally:
+        with _gc_pause_lock:
+            _gc_pause_depth -= 1
+            if _gc_pause_depth == 0 and _gc_was_enabled:
+                gc.enable()
+
+
+def _convert_legacy_log(log_file: str) -> None:
+    """Rewrite a log file holding one JSON array as JSON lines.
+    
+    Older versions rewrote the whole log as an indented JSON array on every
+    entry. Must be called with _log_file_lock held.
+    
+    Args:
+        log_file: Path to the activity log file.
+    """
+    global _legacy_checked
+    if _legacy_checked:
+        return
+    
+    try:
+        with open(log_file, 'rb') as file:
+            legacy = file.read(1) == b"["
+            if legacy:
+                file.seek(0)
+                with _gc_paused():
+                    logs = orjson.loads(file.read())
+    except FileNotFoundError:
+        legacy = False
+    
+    if legacy:
+        temp_file = f"{log_file}.tmp"
+        with open(temp_file, 'wb') as file:
+            file.writelines(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in logs)
+        os.replace(temp_file, log_file)
+        logger.info(f"Converted {len(logs)} activity log entries to JSON lines.")
+    
+    _legacy_checked = True
+
+
+def _log_segments(log_file: str) -> List[str]:
+    """List the paths of the activity log segments.
+    
+    Args:
+        log_file: Path to the active activity log file.
+        
+    Returns:
+        List[str]: Segment paths, newest first.
+    """
+    return [log_file] + [f"{log_file}.{i}" for i in range(1, _LOG_BACKUP_COUNT + 1)]
+
+
+def _rotate_log_file(log_file: str) -> None:
+    """Move the active log into the first backup segment and empty it.
+    
+    The active file is copied and truncated rather than renamed, so it
+    stays usable when mounted into a container as a single file. Must be
+    called with _log_file_lock held.
+    
+    Args:
+        log_file: Path to the active activity log file.
+    """
+    segments = _log_segments(log_file)
+    for i in range(len(segments) - 1, 1, -1):
+        try:
+            os.replace(segments[i - 1], segments[i])
+        except FileNotFoundError:
+            pass
+    if len(segments) > 1:
+        shutil.copyfile(log_file, segments[1])
+    os.truncate(log_file, 0)
+    logger.info(f"Rotated activity log {log_file}.")
+
+
+def _append_to_log_file(entries: List[Dict[str, Any]]) -> None:
+    """Append activity entries to the log file in one write.
+    
+    The log holds one compact JSON object per line, so appending never
+    reads or rewrites earlier entries.
+    
+    Args:
+        entries: Activity log entries to append.
+    """
+    log_file = _LOG_PATH
+    
+    data = b"".join(orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE) for entry in entries)
+    with _log_file_lock:
+        _convert_legacy_log(log_file)
+        # Written straight from the serialized batch, with no file buffer
+        # copy in between; O_APPEND keeps each write at the end of the file
+        fd = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            size = os.lseek(fd, 0, os.SEEK_CUR)
+        finally:
+            os.close(fd)
+        if _LOG_BACKUP_COUNT and 0 < _LOG_MAX_BYTES <= size:
+            _rotate_log_file(log_file)
+
+
+def _read_last_lines(file: BinaryIO, limit: int) -> List[bytes]:
+    """Read the last lines of a file, reading blocks backwards from its end.
+    
+    Args:
+        file: File opened in binary mode.
+        limit: Maximum number of lines to return.
+        
+    Returns:
+        List[bytes]: Up to limit non-empty lines, oldest first.
+    """
+    position = file.seek(0, os.SEEK_END)
+    tail = b""
+    lines: List[bytes] = []
+    while position > 0 and len(lines) < limit:
+        size = min(_LOG_READ_BLOCK_SIZE, position)
+        position -= size
+        file.seek(position)
+        parts = (file.read(size) + tail).split(b"\n")
+        # The first part may continue in the previous block
+        tail = parts[0]
+        lines.extend(line for line in reversed(parts[1:]) if line.strip())
+    if position == 0 and tail.strip():
+        lines.append(tail)
+    lines = lines[:limit]
+    lines.reverse()
+    return lines
+
+
+def _next_log_batch() -> Tuple[List[Dict[str, Any]], bool]:
+    """Wait for queued entries and collect them into one batch.
+    
+    After the first entry arrives, entries are gathered for up to
+    _LOG_FLUSH_SECONDS or until _LOG_BATCH_SIZE of them are queued.
+    
+    Returns:
+        Tuple[List[Dict[str, Any]], bool]: Entries to write, and whether the
+        writer was asked to stop.
+    """
+    batch = []
+    entry = _log_queue.get()
+    deadline = time.monotonic() + _LOG_FLUSH_SECONDS
+    while entry is not _LOG_STOP:
+        batch.append(entry)
+        remaining = deadline - time.monotonic()
+        if len(batch) >= _LOG_BATCH_SIZE or remaining <= 0:
+            return batch, False
+        try:
+            entry = _log_queue.get(timeout=remaining)
+        except queue.Empty:
+            return batch, False
+    return batch, True
+
+
+def _write_activity_logs() -> None:
+    """Write queued activity entries to the log file, batch by batch."""
+    stopping = False
+    while not stopping:
+        batch, stopping = _next_log_batch()
+        if not batch:
+            continue
+        try:
+            _append_to_log_file(batch)
+        except Exception as e:
+            logger.error(f"Error logging user activity: {str(e)}")
+
+
+def _flush_activity_logs() -> None:
+    """Stop the writer at interpreter exit once it has written every queued entry."""
+    try:
+        _log_queue.put(_LOG_STOP, timeout=_LOG_EXIT_TIMEOUT_SECONDS)
+    except queue.Full:
+        logger.error("Activity log writer is stalled; queued entries are lost.")
+        return
+    _log_writer.join(_LOG_EXIT_TIMEOUT_SECONDS)
+
+
+_log_writer = threading.Thread(target=_write_activity_logs, name="activity-log-writer", daemon=True)
+_log_writer.start()
+atexit.register(_flush_activity_logs)
+
+
+def _log_activity_live(log_entry: Dict[str, Any]) -> None:
+    """Record an activity entry in the current session for real-time tracking.
+    
+    Args:
+        log_entry: Activity log entry.
+    """
+    if "user_activity_log" not in st.session_state:
+        st.session_state.user_activity_log = collections.deque(maxlen=_SESSION_LOG_SIZE)
+    
+    st.session_state.user_activity_log.append(log_entry)
+
+
+def _persist_activity(log_entry: Dict[str, Any]) -> None:
+    """Queue an activity entry for the background writer.
+    
+    Args:
+        log_entry: Activity log entry.
+    """
+    try:
+        _log_queue.put_nowait(log_entry)
+    except queue.Full:
+        logger.warning("Activity log queue is full; dropping entry.")
+
+
 def log_activity(username: str, activity: str, details: Optional[str] = None) -> None:
     """Log user activity.
     
+    The entry is kept in the session and queued for the background writer,
+    so callers never wait on the log file.
+    
     Args:
         username: Username of the user performing the activity.
         activity: Type of activity.
         details: Additional details about the activity.
     """
     log_entry = {
-        "timestamp": datetime.now().isoformat(),
+        "ts_ns": time.time_ns(),
         "username": username,
-        "activity": activity,
-        "details": details
+        "activity": activity
     }
+    # Omitted when empty to keep log lines short; restored on read
+    if details is not None:
+        log_entry["details"] = details
     
-    # Add to session state for real-time tracking
-    if "user_activity_log" not in st.session_state:
-        st.session_state.user_activity_log = []
-    
-    st.session_state.user_activity_log.append(log_entry)
+    _log_activity_live(log_entry)
+    _persist_activity(log_entry)
     
-    # Log to file
-    try:
-        from src.utils.config import Config
-        log_file = Config.USER_ACTIVITY_LOG_PATH
-        
-        existing_logs = []
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as file:
-                existing_logs = json.load(file)
-        
-        existing_logs.append(log_entry)
-        
-        with open(log_file, 'w') as file:
-            json.dump(existing_logs, file, indent=2)
-    except Exception as e:
-        logger.error(f"Error logging user activity: {str(e)}")
-    
-    # Log to Python logger
-    logger.info(f"User activity: {username} - {activity} - {details}")
+    # Formatted by the handler, and only if the record is emitted
+    logger.info("User activity: %s - %s - %s", username, activity, details)
 
 def get_activity_logs(limit: int = 100) -> list:
     """Get activity logs.
@@ -70,17 +328,33 @@ def get_activity_logs(limit: int = 100) -> list:
         list: List of activity logs.
     """
     try:
-        from src.utils.config import Config
-        log_file = Config.USER_ACTIVITY_LOG_PATH
+        log_file = _LOG_PATH
+        
+        # Only the newest lines are read, from the newest segment backwards;
+        # the lock keeps a rotation from moving lines between segments
+        lines: List[bytes] = []
+        with _log_file_lock:
+            _convert_legacy_log(log_file)
+            for segment in _log_segments(log_file):
+                try:
+                    with open(segment, 'rb') as file:
+                        lines = _read_last_lines(file, limit - len(lines)) + lines
+                except FileNotFoundError:
+                    continue
+                if len(lines) >= limit:
+                    break
+        
+        # Entries are appended in order, so the newest come last
+        with _gc_paused():
+            logs = [orjson.loads(line) for line in reversed(lines)]
         
-        if os.path.exists(log_file):
-            with open(log_file, 'r') as file:
-                logs = json.load(file)
-            
-            # Sort by timestamp in descending order
-            logs.sort(key=lambda x: x["timestamp"], reverse=True)
-            
-            return logs[:limit]
+        # Only the returned entries get a formatted timestamp; entries from
+        # older versions already store one
+        for entry in logs:
+            if "ts_ns" in entry:
+                entry["timestamp"] = datetime.fromtimestamp(entry.pop("ts_ns") / 1e9).isoformat()
+            entry.setdefault("details", None)
+        return logs
     except Exception as e:
         logger.error(f"Error getting activity logs: {str(e)}")
     
@@ -1,24 +1,71 @@
 """Security utilities for the application."""
 
 import hashlib
-import secrets
+import hmac
+import os
 import string
-from typing import Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+from argon2 import PasswordHasher
+from argon2.exceptions import InvalidHashError, VerificationError
+
+# Argon2id runs in argon2-cffi's C implementation; one instance is shared per process
+_PASSWORD_HASHER = PasswordHasher(time_cost=2, memory_cost=65536, parallelism=1)
+
+# Token characters, and the bound below which random bytes map onto them evenly
+_TOKEN_ALPHABET = np.frombuffer((string.ascii_letters + string.digits).encode(), dtype=np.uint8)
+_TOKEN_BYTE_LIMIT = 256 - 256 % len(_TOKEN_ALPHABET)
+
+# HTML escapes applied by sanitize_input; "&" is included so existing entities are not left ambiguous
+_HTML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+# Initialized SHA-256 context; copying it skips the OpenSSL digest lookup and setup per item
+_SHA256 = hashlib.sha256()
+
+# hashlib releases the GIL while hashing inputs over 2 KiB, so batches of at
+# least _PARALLEL_HASH_MIN_BYTES are hashed on up to _HASH_WORKERS threads
+_PARALLEL_HASH_MIN_BYTES = 4 << 20
+_HASH_WORKERS = min(8, os.cpu_count() or 1)
+
+def _matches_legacy_hash(digest: bytes, hashed_password: str) -> bool:
+    """Compare a SHA-256 digest with a stored hex hash in constant time.
+    
+    Args:
+        digest: Raw SHA-256 digest of the password.
+        hashed_password: Hex SHA-256 hash stored by earlier versions.
+        
+    Returns:
+        bool: True if they match, False otherwise.
+    """
+    try:
+        return hmac.compare_digest(digest, bytes.fromhex(hashed_password))
+    except ValueError:
+        return False
 
 def hash_password(password: str) -> str:
-    """Hash a password using SHA-256.
+    """Hash a password using Argon2id.
     
     Args:
         password: Password to hash.
         
     Returns:
-        str: Hashed password.
+        str: Encoded Argon2 hash, including its salt and parameters.
     """
-    return hashlib.sha256(password.encode()).hexdigest()
+    return _PASSWORD_HASHER.hash(password)
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """Verify a password against a hash.
     
+    Unsalted SHA-256 hashes stored by earlier versions are still accepted.
+    
     Args:
         password: Password to verify.
         hashed_password: Hashed password to compare against.
@@ -26,7 +73,95 @@ def verify_password(password: str, hashed_password: str) -> bool:
     Returns:
         bool: True if password matches hash, False otherwise.
     """
-    return hash_password(password) == hashed_password
+    if not hashed_password.startswith("$argon2"):
+        return _matches_legacy_hash(hashlib.sha256(password.encode()).digest(), hashed_password)
+    
+    try:
+        return _PASSWORD_HASHER.verify(hashed_password, password)
+    except (VerificationError, InvalidHashError):
+        return False
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash should be replaced by a fresh hash_password one.
+    
+    Args:
+        hashed_password: Stored password hash.
+        
+    Returns:
+        bool: True for unsalted SHA-256 hashes and Argon2 hashes made with
+        other parameters, False otherwise.
+    """
+    if not hashed_password.startswith("$argon2"):
+        return True
+    
+    try:
+        return _PASSWORD_HASHER.check_needs_rehash(hashed_password)
+    except InvalidHashError:
+        return True
+
+def verify_many(passwords: Sequence[str], hashed_passwords: Sequence[str]) -> np.ndarray:
+    """Verify many passwords against their hashes.
+    
+    Unsalted SHA-256 hashes are checked together through sha256_many;
+    Argon2 hashes are verified one by one, since each carries its own salt.
+    
+    Args:
+        passwords: Passwords to verify.
+        hashed_passwords: Hashed password to compare each password against.
+        
+    Returns:
+        np.ndarray: Boolean array, True where a password matches its hash.
+    """
+    results = np.zeros(len(passwords), dtype=bool)
+    legacy = []
+    for i, (password, hashed_password) in enumerate(zip(passwords, hashed_passwords)):
+        if hashed_password.startswith("$argon2"):
+            results[i] = verify_password(password, hashed_password)
+        else:
+            legacy.append(i)
+    
+    digests = sha256_many(passwords[i].encode() for i in legacy)
+    for i, digest in zip(legacy, digests):
+        results[i] = _matches_legacy_hash(digest, hashed_passwords[i])
+    return results
+
+def _sha256_sequence(items: Sequence[bytes]) -> List[bytes]:
+    """Compute the SHA-256 digests of byte strings on the calling thread.
+    
+    Args:
+        items: Byte strings to hash.
+        
+    Returns:
+        List[bytes]: 32-byte digest of each item, in order.
+    """
+    digests = []
+    for item in items:
+        digest = _SHA256.copy()
+        digest.update(item)
+        digests.append(digest.digest())
+    return digests
+
+def sha256_many(items: Iterable[bytes]) -> List[bytes]:
+    """Compute the SHA-256 digests of many byte strings.
+    
+    For content addressing, not passwords. hashlib runs OpenSSL's SHA-256,
+    which uses the CPU's SHA extensions where available. Large batches are
+    split into one slice per worker thread.
+    
+    Args:
+        items: Byte strings to hash.
+        
+    Returns:
+        List[bytes]: 32-byte digest of each item, in order.
+    """
+    items = list(items)
+    if _HASH_WORKERS == 1 or sum(map(len, items)) < _PARALLEL_HASH_MIN_BYTES:
+        return _sha256_sequence(items)
+    
+    step = -(-len(items) // _HASH_WORKERS)
+    slices = [items[i:i + step] for i in range(0, len(items), step)]
+    with ThreadPoolExecutor(max_workers=len(slices)) as executor:
+        return [digest for digests in executor.map(_sha256_sequence, slices) for digest in digests]
 
 def generate_secure_token(length: int = 32) -> str:
     """Generate a secure random token.
@@ -37,8 +172,13 @@ def generate_secure_token(length: int = 32) -> str:
     Returns:
         str: Secure random token.
     """
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    # One urandom call per round; bytes past the last whole multiple of the
+    # alphabet size are dropped so the modulo keeps characters uniform
+    indexes = np.empty(0, dtype=np.uint8)
+    while len(indexes) < length:
+        raw = np.frombuffer(os.urandom(2 * length), dtype=np.uint8)
+        indexes = np.concatenate((indexes, raw[raw < _TOKEN_BYTE_LIMIT]))
+    return _TOKEN_ALPHABET[indexes[:length] % len(_TOKEN_ALPHABET)].tobytes().decode()
 
 def sanitize_input(input_str: str) -> str:
     """Sanitize user input to prevent injection attacks.
@@ -49,6 +189,5 @@ def sanitize_input(input_str: str) -> str:
     Returns:
         str: Sanitized input string.
     """
-    # Remove potentially dangerous characters
-    sanitized = input_str.replace("<", "&lt;").replace(">", "&gt;")
-    return sanitized
+    # Escape HTML special characters in a single pass
+    return input_str.translate(_HTML_ESCAPE)
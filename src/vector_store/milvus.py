@@ -1,8 +1,10 @@
 """Milvus vector store integration."""
 
-import os
-from typing import Optional
+import threading
+import time
+from typing import Any, List, Optional, Sequence, Set
 
+import numpy as np
 import streamlit as st
 from llama_index.vector_stores.milvus import MilvusVectorStore
 
@@ -10,30 +12,212 @@ from src.utils.logger import logger
 from src.utils.config import Config
 
 
-def get_vector_store() -> MilvusVectorStore:
-    """Get a Milvus vector store instance.
+# Document ids looked up per collection query, keeping each filter short
+_DOC_ID_QUERY_BATCH = 512
+
+# Bumped whenever the collection changes, invalidating every session's semantic cache
+_cache_generation = 0
+_cache_generation_lock = threading.Lock()
+
+
+class SemanticCache:
+    """Responses to recent queries, looked up by query embedding similarity.
+    
+    Embeddings are kept normalized in one float32 matrix, so a lookup is a
+    single matrix-vector product. When the cache is full, the oldest entry
+    is replaced.
+    """
+    
+    def __init__(self, dim: int, capacity: int, threshold: float, ttl_seconds: float):
+        """Initialize the semantic cache.
+        
+        Args:
+            dim: Dimension of the query embeddings.
+            capacity: Maximum number of cached responses.
+            threshold: Cosine similarity at or above which a response is reused.
+            ttl_seconds: Seconds a cached response stays valid.
+        """
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._vectors = np.zeros((capacity, dim), dtype=np.float32)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._responses: List[Optional[str]] = [None] * capacity
+        self._size = 0
+        self._next = 0
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> Optional[np.ndarray]:
+        """Convert an embedding to a unit-length float32 vector.
+        
+        Args:
+            embedding: Query embedding.
+            
+        Returns:
+            Optional[np.ndarray]: Normalized vector, or None for a zero vector.
+        """
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+    
+    def lookup(self, embedding: Sequence[float]) -> Optional[str]:
+        """Get the cached response to the most similar unexpired query.
+        
+        Args:
+            embedding: Query embedding.
+            
+        Returns:
+            Optional[str]: Cached response if one is similar enough, None otherwise.
+        """
+        vector = self._normalize(embedding)
+        if vector is None:
+            return None
+        
+        with self._lock:
+            if not self._size:
+                return None
+            similarities = self._vectors[:self._size] @ vector
+            similarities[self._expires[:self._size] < time.time()] = -np.inf
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                return self._responses[best]
+        return None
+    
+    def add(self, embedding: Sequence[float], response: str) -> None:
+        """Cache the response to a query.
+        
+        Args:
+            embedding: Query embedding.
+            response: Full response to the query.
+        """
+        vector = self._normalize(embedding)
+        if vector is None or len(self._responses) == 0:
+            return
+        
+        with self._lock:
+            slot = self._next
+            self._vectors[slot] = vector
+            self._expires[slot] = time.time() + self.ttl_seconds
+            self._responses[slot] = response
+            self._next = (slot + 1) % len(self._responses)
+            self._size = max(self._size, slot + 1)
+    
+    def clear(self) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._responses = [None] * len(self._responses)
+            self._size = 0
+            self._next = 0
+
+
+def get_semantic_cache(query_engine: Any) -> SemanticCache:
+    """Get this session's semantic response cache for a query engine.
+    
+    Query engines only retrieve the documents of the user they were built
+    for, so responses are only reused within the session, and only for the
+    same query engine. Caches made before the collection last changed are
+    replaced. With SEMANTIC_CACHE_SIZE 0 (the default), nothing is cached.
+    
+    Args:
+        query_engine: Query engine whose responses are cached.
+        
+    Returns:
+        SemanticCache: Semantic cache instance.
+    """
+    cached = st.session_state.get("_semantic_cache")
+    if cached is None or cached[0] is not query_engine or cached[1] != _cache_generation:
+        cached = (query_engine, _cache_generation, SemanticCache(
+            dim=Config.EMBEDDING_DIMENSION,
+            capacity=Config.SEMANTIC_CACHE_SIZE,
+            threshold=Config.SEMANTIC_CACHE_THRESHOLD,
+            ttl_seconds=Config.SEMANTIC_CACHE_TTL_SECONDS
+        ))
+        st.session_state._semantic_cache = cached
+    return cached[2]
+
+
+def clear_semantic_cache() -> None:
+    """Discard the cached responses of every session.
+    
+    Called after documents are added to or removed from the collection.
+    """
+    global _cache_generation
+    with _cache_generation_lock:
+        _cache_generation += 1
+    st.session_state.pop("_semantic_cache", None)
+
+
+@st.cache_resource(show_spinner=False)
+def _build_vector_store() -> MilvusVectorStore:
+    """Connect to the Milvus collection once per process.
+    
+    The collection is kept as is, so documents indexed by earlier sessions
+    stay searchable.
     
     Returns:
         MilvusVectorStore: Milvus vector store instance.
     """
-    # Check if vector store already exists in session state
-    if "vector_store" in st.session_state and st.session_state.vector_store:
-        return st.session_state.vector_store
+    vector_store = MilvusVectorStore(
+        uri=Config.VECTOR_STORE_PATH,
+        dim=Config.EMBEDDING_DIMENSION,
+        overwrite=False
+    )
+    logger.info(f"Connected to Milvus vector store at {Config.VECTOR_STORE_PATH}")
+    return vector_store
+
+
+def get_vector_store() -> MilvusVectorStore:
+    """Get the Milvus vector store shared by all sessions.
     
-    # Create new vector store
+    Returns:
+        MilvusVectorStore: Milvus vector store instance.
+    """
     try:
-        vector_store = MilvusVectorStore(
-            uri=Config.VECTOR_STORE_PATH,
-            dim=Config.EMBEDDING_DIMENSION,
-            overwrite=True
-        )
-        
-        # Save to session state
-        st.session_state.vector_store = vector_store
-        
-        logger.info(f"Created Milvus vector store at {Config.VECTOR_STORE_PATH}")
-        return vector_store
+        return _build_vector_store()
     except Exception as e:
         logger.error(f"Error creating Milvus vector store: {str(e)}")
         st.error(f"Error creating Milvus vector store: {str(e)}")
         raise
+
+
+def indexed_doc_ids(vector_store: MilvusVectorStore, doc_ids: Sequence[str]) -> Set[str]:
+    """Find the document ids that already have nodes in the collection.
+    
+    Args:
+        vector_store: Milvus vector store to search.
+        doc_ids: Document ids to look up; they must not contain quotes.
+        
+    Returns:
+        Set[str]: The given ids that are stored in the collection.
+    """
+    field = getattr(vector_store, "doc_id_field", "doc_id")
+    found = set()
+    for start in range(0, len(doc_ids), _DOC_ID_QUERY_BATCH):
+        quoted = ",".join(f'"{doc_id}"' for doc_id in doc_ids[start:start + _DOC_ID_QUERY_BATCH])
+        rows = vector_store.client.query(
+            collection_name=vector_store.collection_name,
+            filter=f"{field} in [{quoted}]",
+            output_fields=[field]
+        )
+        found.update(row[field] for row in rows)
+    return found
+
+
+def rebuild_vector_store() -> MilvusVectorStore:
+    """Drop and recreate the Milvus collection, removing every indexed document.
+    
+    Session indexes built on the previous store are dropped on their next
+    use, as they no longer match get_vector_store().
+    
+    Returns:
+        MilvusVectorStore: Milvus vector store instance for the empty collection.
+    """
+    _build_vector_store.clear()
+    MilvusVectorStore(
+        uri=Config.VECTOR_STORE_PATH,
+        dim=Config.EMBEDDING_DIMENSION,
+        overwrite=True
+    )
+    clear_semantic_cache()
+    logger.info(f"Recreated Milvus vector store at {Config.VECTOR_STORE_PATH}")
+    return get_vector_store()
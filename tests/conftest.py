@@ -0,0 +1,14 @@
+"""Shared pytest fixtures."""
+
+import pytest
+import streamlit as st
+
+
+@pytest.fixture(autouse=True)
+def clear_streamlit_state():
+    """Start every test with empty session state and resource caches."""
+    st.session_state.clear()
+    st.cache_resource.clear()
+    yield
+    st.session_state.clear()
+    st.cache_resource.clear()
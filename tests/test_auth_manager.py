@@ -0,0 +1,56 @@
+"""Tests for the authentication manager."""
+
+import hashlib
+
+import src.auth.auth_manager as auth_manager_module
+from src.auth.auth_manager import AuthManager, get_auth_manager
+from src.database.sqlite import SQLiteDatabase
+
+
+class FakeDatabase:
+    """Stand-in for a connected database."""
+
+
+def test_manager_is_shared_once_database_connects(monkeypatch):
+    databases = [None, FakeDatabase()]
+    monkeypatch.setattr(auth_manager_module, "get_database", lambda: databases[0])
+    
+    first = get_auth_manager()
+    assert first.db is None
+    
+    # The database connects after the first lookup failed
+    databases.pop(0)
+    second = get_auth_manager()
+    assert second.db is databases[0]
+    assert get_auth_manager() is second
+
+
+def test_explicit_database_bypasses_cache(monkeypatch):
+    monkeypatch.setattr(auth_manager_module, "get_database", lambda: FakeDatabase())
+    shared = get_auth_manager()
+    
+    db = FakeDatabase()
+    explicit = get_auth_manager(db)
+    assert isinstance(explicit, AuthManager)
+    assert explicit.db is db
+    assert get_auth_manager() is shared
+
+
+def test_login_upgrades_legacy_password_hash(monkeypatch):
+    monkeypatch.setattr(auth_manager_module, "log_activity", lambda *args, **kwargs: None)
+    db = SQLiteDatabase(":memory:")
+    assert db.initialize()
+    try:
+        db.store_user("alice", hashlib.sha256(b"s3cret").hexdigest())
+        manager = AuthManager(db)
+        
+        assert not manager.authenticate_user("alice", "wrong")
+        assert not db.get_user("alice")["password_hash"].startswith("$argon2")
+        
+        assert manager.authenticate_user("alice", "s3cret")
+        upgraded = db.get_user("alice")["password_hash"]
+        assert upgraded.startswith("$argon2")
+        assert manager.authenticate_user("alice", "s3cret")
+        assert db.get_user("alice")["password_hash"] == upgraded
+    finally:
+        db.close()
@@ -0,0 +1,108 @@
+"""Tests for the embedding cache's SimHash fingerprints and band lookup."""
+
+import pytest
+
+from src.llm.cached_embedding import (
+    CachedNVIDIAEmbedding,
+    _MIN_FUZZY_WORDS,
+    _bands,
+    _fingerprint_row,
+    _simhash,
+)
+from src.utils.config import Config
+
+PASSAGE = (
+    "The quarterly report shows that revenue grew steadily across all regions "
+    "while operating costs remained flat compared with the previous year"
+)
+EDITED_PASSAGE = PASSAGE.replace("steadily", "slowly")
+OTHER_PASSAGE = (
+    "Install the package with pip and set the API key in the environment "
+    "before starting the server on the default port for local testing"
+)
+
+
+def _distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+@pytest.fixture
+def embedding_model(tmp_path):
+    model = CachedNVIDIAEmbedding(
+        model=Config.EMBEDDING_MODEL,
+        api_key="nvapi-test",
+        cache_path=str(tmp_path / "embedding_cache.db")
+    )
+    yield model
+    if model._store is not None:
+        model._store.close()
+
+
+def test_simhash_needs_enough_words():
+    assert _simhash(" ".join(["word"] * (_MIN_FUZZY_WORDS - 1))) is None
+    assert _simhash(" ".join(["word"] * _MIN_FUZZY_WORDS)) is not None
+
+
+def test_simhash_is_stable_and_close_for_small_edits():
+    simhash = _simhash(PASSAGE)
+    assert simhash == _simhash(PASSAGE.upper())
+    assert 0 <= simhash < 1 << 64
+    assert _distance(simhash, _simhash(EDITED_PASSAGE)) < _distance(simhash, _simhash(OTHER_PASSAGE))
+
+
+def test_bands_split_fingerprint_into_16_bit_parts():
+    simhash = 0xFEDCBA9876543210
+    bands = _bands(simhash)
+    assert bands == (0x3210, 0x7654, 0xBA98, 0xFEDC)
+    assert sum(band << shift for band, shift in zip(bands, (0, 16, 32, 48))) == simhash
+
+
+def test_fingerprint_row_stores_signed_simhash():
+    row = _fingerprint_row("key", 0xFFFFFFFFFFFFFFFF)
+    assert row[:2] == ("key", -1)
+    assert row[2:] == (0xFFFF,) * 4
+    assert _fingerprint_row("key", 5)[1] == 5
+
+
+def test_zero_threshold_disables_fuzzy_reuse(embedding_model, monkeypatch):
+    monkeypatch.setattr(Config, "FUZZY_EMBED_THRESHOLD", 0)
+    key = embedding_model._cache_key(PASSAGE)
+    embedding_model._remember({key: [0.5, 0.25]}, {key: PASSAGE})
+    
+    assert embedding_model._store.execute("SELECT COUNT(*) FROM fingerprints").fetchone() == (0,)
+    assert embedding_model._lookup_similar({"other": PASSAGE}) == {}
+
+
+def test_band_lookup_reuses_near_duplicate(embedding_model, monkeypatch):
+    monkeypatch.setattr(Config, "FUZZY_EMBED_THRESHOLD", 3)
+    key = embedding_model._cache_key(PASSAGE)
+    embedding_model._remember({key: [0.5, 0.25]}, {key: PASSAGE})
+    
+    # Same fingerprint, different passage
+    assert embedding_model._lookup_similar({"copy": PASSAGE + " "}) == {"copy": [0.5, 0.25]}
+    assert embedding_model._lookup_similar({"other": OTHER_PASSAGE}) == {}
+
+
+def test_band_lookup_respects_threshold(embedding_model, monkeypatch):
+    monkeypatch.setattr(Config, "FUZZY_EMBED_THRESHOLD", 3)
+    simhash = _simhash(PASSAGE)
+    store = embedding_model._connect()
+    
+    # Stored fingerprints 3 and 4 bits away from the passage; each shares
+    # three of its four bands
+    for key, flipped, vector in (("near", 0b111, [1.0]), ("far", 0b1111 << 16, [2.0])):
+        embedding_model._remember({key: vector})
+        with store:
+            store.execute(
+                "INSERT INTO embeddings (key, vector) VALUES (?, ?)",
+                (key, embedding_model._memory[key][1].tobytes())
+            )
+            store.execute(
+                "INSERT INTO fingerprints VALUES (?, ?, ?, ?, ?, ?)",
+                _fingerprint_row(key, simhash ^ flipped)
+            )
+    
+    assert embedding_model._lookup_similar({"query": PASSAGE}) == {"query": [1.0]}
+    
+    monkeypatch.setattr(Config, "FUZZY_EMBED_THRESHOLD", 2)
+    assert embedding_model._lookup_similar({"query": PASSAGE}) == {}
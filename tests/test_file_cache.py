@@ -0,0 +1,70 @@
+"""Tests for the mtime-keyed YAML and JSON file cache."""
+
+import os
+
+from src.utils.file_cache import load_json, load_yaml, save_json, save_yaml
+
+
+def _touch_later(path) -> None:
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+def test_yaml_is_parsed_once_while_unchanged(tmp_path):
+    path = str(tmp_path / "users.yaml")
+    assert load_yaml(path) is None
+    
+    with open(path, "w") as file:
+        file.write("users:\n  alice:\n    is_admin: true\n")
+    first = load_yaml(path)
+    assert first == {"users": {"alice": {"is_admin": True}}}
+    assert load_yaml(path) is first
+
+
+def test_yaml_is_reloaded_after_external_change(tmp_path):
+    path = str(tmp_path / "users.yaml")
+    with open(path, "w") as file:
+        file.write("users: {}\n")
+    first = load_yaml(path)
+    
+    with open(path, "w") as file:
+        file.write("users: {bob: {}}\n")
+    _touch_later(path)
+    assert load_yaml(path) == {"users": {"bob": {}}}
+    assert load_yaml(path) is not first
+
+
+def test_save_yaml_refreshes_cached_copy(tmp_path):
+    path = str(tmp_path / "users.yaml")
+    data = {"users": {"alice": {"created_at": "2024-01-02T03:04:05"}}}
+    save_yaml(path, data)
+    assert load_yaml(path) is data
+    
+    # Timestamps stay the ISO strings they were written as
+    with open(path, "w") as file:
+        file.write("created_at: 2024-01-02T03:04:05\n")
+    _touch_later(path)
+    assert load_yaml(path) == {"created_at": "2024-01-02T03:04:05"}
+
+
+def test_empty_yaml_file_loads_as_none(tmp_path):
+    path = tmp_path / "users.yaml"
+    path.write_text("")
+    assert load_yaml(str(path)) is None
+
+
+def test_json_round_trip_and_reload(tmp_path):
+    path = str(tmp_path / "sessions.json")
+    assert load_json(path) is None
+    
+    sessions = {"s1": {"username": "alice", "expires_at": 1700000000}}
+    save_json(path, sessions)
+    assert load_json(path) is sessions
+    
+    with open(path, "w") as file:
+        file.write('{"s2": {"username": "bob", "expires_at": 1}}')
+    _touch_later(path)
+    assert load_json(path) == {"s2": {"username": "bob", "expires_at": 1}}
+    
+    os.remove(path)
+    assert load_json(path) is None
@@ -0,0 +1,91 @@
+"""Tests for the activity log writer and reader."""
+
+import io
+
+import pytest
+
+import src.utils.logger as logger_module
+from src.utils.logger import _append_to_log_file, _read_last_lines, get_activity_logs
+
+
+@pytest.fixture
+def log_path(tmp_path, monkeypatch):
+    path = tmp_path / "user_activity.json"
+    monkeypatch.setattr(logger_module, "_LOG_PATH", str(path))
+    monkeypatch.setattr(logger_module, "_legacy_checked", False)
+    return path
+
+
+def _entries(start: int, stop: int) -> list:
+    return [{"ts_ns": n, "username": "user", "activity": f"activity-{n}"} for n in range(start, stop)]
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 64, 1 << 16])
+@pytest.mark.parametrize("data", [
+    b"",
+    b"single",
+    b"a\nbb\n\nccc\nd",
+    b"a\nbb\nccc\n",
+    b"x" * 20 + b"\n" + b"y" * 3 + b"\n",
+])
+def test_read_last_lines_across_block_boundaries(monkeypatch, block_size, data):
+    monkeypatch.setattr(logger_module, "_LOG_READ_BLOCK_SIZE", block_size)
+    lines = [line for line in data.split(b"\n") if line.strip()]
+    for limit in (1, 2, 3, 10):
+        assert _read_last_lines(io.BytesIO(data), limit) == lines[-limit:]
+
+
+def test_rotation_keeps_backup_segments(log_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "_LOG_MAX_BYTES", 200)
+    monkeypatch.setattr(logger_module, "_LOG_BACKUP_COUNT", 2)
+    for n in range(60):
+        _append_to_log_file(_entries(n, n + 1))
+    
+    segments = sorted(path.name for path in log_path.parent.iterdir())
+    assert segments == ["user_activity.json", "user_activity.json.1", "user_activity.json.2"]
+    assert log_path.stat().st_size < 200
+
+
+def test_reads_walk_segments_newest_first(log_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "_LOG_MAX_BYTES", 400)
+    monkeypatch.setattr(logger_module, "_LOG_BACKUP_COUNT", 2)
+    monkeypatch.setattr(logger_module, "_LOG_READ_BLOCK_SIZE", 16)
+    for n in range(60):
+        _append_to_log_file(_entries(n, n + 1))
+    
+    newest = [entry["activity"] for entry in get_activity_logs(10)]
+    assert newest == [f"activity-{n}" for n in range(59, 49, -1)]
+    
+    # Asking for more than is kept returns every retained entry, in order
+    retained = [entry["activity"] for entry in get_activity_logs(1000)]
+    numbers = [int(activity.split("-")[1]) for activity in retained]
+    assert numbers == list(range(59, 59 - len(numbers), -1))
+    assert len(numbers) > len(_read_last_lines(io.BytesIO(log_path.read_bytes()), 1000))
+
+
+def test_no_backups_never_discards_the_log(log_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "_LOG_MAX_BYTES", 100)
+    monkeypatch.setattr(logger_module, "_LOG_BACKUP_COUNT", 0)
+    for n in range(30):
+        _append_to_log_file(_entries(n, n + 1))
+    
+    assert [path.name for path in log_path.parent.iterdir()] == ["user_activity.json"]
+    assert len(get_activity_logs(100)) == 30
+
+
+def test_entries_are_returned_with_timestamp_and_details(log_path):
+    _append_to_log_file([{"timestamp": "2024-01-01T00:00:00", "username": "old", "activity": "login", "details": None}])
+    _append_to_log_file([{"ts_ns": 1_700_000_000_000_000_000, "username": "new", "activity": "query", "details": "q"}])
+    
+    newest, oldest = get_activity_logs(10)
+    assert newest["username"] == "new"
+    assert "ts_ns" not in newest and newest["timestamp"].startswith("2023-11-1")
+    assert oldest == {"timestamp": "2024-01-01T00:00:00", "username": "old", "activity": "login", "details": None}
+
+
+def test_legacy_json_array_is_converted(log_path):
+    log_path.write_text('[\n  {"timestamp": "2024-01-01T00:00:00", "username": "a", "activity": "login", "details": null}\n]')
+    _append_to_log_file(_entries(0, 1))
+    
+    assert [entry["username"] for entry in get_activity_logs(10)] == ["user", "a"]
+    assert log_path.read_bytes().count(b"\n") == 2
@@ -0,0 +1,34 @@
+"""Tests for document chunking."""
+
+from llama_index.core import Document
+
+import src.document_processing.processor as processor_module
+from src.document_processing.processor import DocumentProcessor, _split_pool
+from src.utils.config import Config
+
+
+def _documents(count: int) -> list:
+    sentence = "This sentence is repeated to fill a few chunks. "
+    return [Document(text=sentence * 40 * (i + 1), metadata={"file_name": f"doc-{i}.txt"}) for i in range(count)]
+
+
+def test_pooled_chunking_matches_in_process_chunking(monkeypatch):
+    documents = _documents(processor_module.PARALLEL_MIN_DOCUMENTS)
+    processor = DocumentProcessor(chunk_size=64, chunk_overlap=8)
+    
+    monkeypatch.setattr(Config, "CHUNK_WORKERS", 1)
+    expected = processor.process_documents(documents)
+    
+    monkeypatch.setattr(Config, "CHUNK_WORKERS", 2)
+    _split_pool.cache_clear()
+    try:
+        pooled = processor.process_documents(documents)
+        # Later uploads reuse the same workers
+        assert _split_pool() is _split_pool()
+        assert _split_pool()._mp_context.get_start_method() != "fork"
+    finally:
+        _split_pool().shutdown()
+        _split_pool.cache_clear()
+    
+    assert len(expected) > len(documents)
+    assert [(doc.text, doc.metadata) for doc in pooled] == [(doc.text, doc.metadata) for doc in expected]
@@ -0,0 +1,124 @@
+"""Tests for streaming query responses."""
+
+import threading
+
+import pytest
+from llama_index.core import MockEmbedding, Settings
+from llama_index.core.base.response.schema import AsyncStreamingResponse, Response, StreamingResponse
+
+import src.llm.query_engine as query_engine_module
+from src.llm.query_engine import QueryProcessor, stream_response
+from src.utils.config import Config
+
+
+class FakeQueryEngine:
+    """Query engine answering every query with a fixed response object."""
+    
+    def __init__(self, make_response):
+        self.make_response = make_response
+        self.queries = []
+    
+    async def aquery(self, query):
+        self.queries.append(query)
+        return self.make_response()
+
+
+def _tokens():
+    yield from ["Hel", "lo", "!"]
+
+
+@pytest.fixture
+def recorded(monkeypatch):
+    monkeypatch.setattr(Settings, "_embed_model", MockEmbedding(embed_dim=Config.EMBEDDING_DIMENSION))
+    query_engine_module._query_embedding.cache_clear()
+    queries = []
+    monkeypatch.setattr(query_engine_module, "record_query", lambda message, response: queries.append((message, response)))
+    yield queries
+    query_engine_module._query_embedding.cache_clear()
+
+
+async def _async_tokens():
+    for token in _tokens():
+        yield token
+
+
+def test_streams_async_responses():
+    engine = FakeQueryEngine(lambda: AsyncStreamingResponse(_async_tokens()))
+    assert list(stream_response(engine, "hi")) == ["Hel", "lo", "!"]
+
+
+def test_streams_sync_responses_off_the_event_loop():
+    threads = set()
+    
+    def tokens():
+        for token in _tokens():
+            threads.add(threading.current_thread().name)
+            yield token
+    
+    engine = FakeQueryEngine(lambda: StreamingResponse(tokens()))
+    completed = []
+    assert list(stream_response(engine, "hi", on_complete=completed.append)) == ["Hel", "lo", "!"]
+    assert completed == ["Hello!"]
+    assert "llm-event-loop" not in threads
+
+
+def test_non_streaming_response_is_yielded_whole():
+    engine = FakeQueryEngine(lambda: Response("Hello!"))
+    completed = []
+    assert list(stream_response(engine, "hi", on_complete=completed.append)) == ["Hello!"]
+    assert completed == ["Hello!"]
+
+
+def test_errors_are_reported_without_completing():
+    def fail():
+        raise RuntimeError("boom")
+    
+    completed = []
+    chunks = list(stream_response(FakeQueryEngine(fail), "hi", on_complete=completed.append))
+    assert chunks == ["Error generating response: boom"]
+    assert completed == []
+
+
+def test_without_query_engine_asks_for_documents():
+    assert list(stream_response(None, "hi")) == ["Please load documents first."]
+
+
+def test_process_query_groups_tokens_and_reports_completion(recorded):
+    tokens = [f"t{i}" for i in range(query_engine_module.TOKENS_PER_UPDATE * 2 + 1)]
+    engine = FakeQueryEngine(lambda: StreamingResponse(iter(tokens)))
+    completed = []
+    
+    chunks = list(QueryProcessor(engine).process_query("hi", completed.append))
+    assert chunks == ["".join(tokens[:4]), "".join(tokens[4:8]), tokens[8]]
+    assert completed == ["".join(tokens)]
+    assert recorded == [("hi", "".join(tokens))]
+    # Retrieval reuses the embedding computed for the cache lookup
+    assert engine.queries[0].embedding is not None
+
+
+def test_process_query_without_engine_asks_for_documents(recorded):
+    completed = []
+    assert list(QueryProcessor().process_query("hi", completed.append)) == ["Please load documents first."]
+    assert completed == ["Please load documents first."]
+    assert recorded == []
+
+
+def test_similar_query_is_answered_from_the_semantic_cache(recorded, monkeypatch):
+    monkeypatch.setattr(Config, "SEMANTIC_CACHE_SIZE", 8)
+    engine = FakeQueryEngine(lambda: AsyncStreamingResponse(_async_tokens()))
+    processor = QueryProcessor(engine)
+    
+    assert "".join(processor.process_query("hi")) == "Hello!"
+    assert list(processor.process_query("hi")) == ["Hello!"]
+    assert len(engine.queries) == 1
+    assert recorded == [("hi", "Hello!"), ("hi", "Hello!")]
+
+
+def test_zero_cache_size_always_queries_the_engine(recorded, monkeypatch):
+    monkeypatch.setattr(Config, "SEMANTIC_CACHE_SIZE", 0)
+    engine = FakeQueryEngine(lambda: AsyncStreamingResponse(_async_tokens()))
+    processor = QueryProcessor(engine)
+    
+    for _ in range(2):
+        assert "".join(processor.process_query("hi")) == "Hello!"
+    assert len(engine.queries) == 2
@@ -0,0 +1,65 @@
+"""Tests for password hashing and digest helpers."""
+
+import hashlib
+
+import pytest
+from argon2 import PasswordHasher
+
+import src.utils.security as security
+from src.utils.security import (
+    generate_secure_token, hash_password, password_needs_rehash, sha256_many, verify_many, verify_password
+)
+
+
+def legacy_hash(password: str) -> str:
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def test_argon2_round_trip():
+    hashed = hash_password("s3cret")
+    assert hashed.startswith("$argon2")
+    assert hashed != hash_password("s3cret")
+    assert verify_password("s3cret", hashed)
+    assert not verify_password("wrong", hashed)
+
+
+def test_legacy_sha256_hashes_still_verify():
+    hashed = legacy_hash("s3cret")
+    assert verify_password("s3cret", hashed)
+    assert verify_password("s3cret", hashed.upper())
+    assert not verify_password("wrong", hashed)
+
+
+@pytest.mark.parametrize("hashed", ["", "not-hex", legacy_hash("s3cret")[:-2], "$argon2id$garbage"])
+def test_malformed_hashes_are_rejected(hashed):
+    assert not verify_password("s3cret", hashed)
+
+
+def test_password_needs_rehash():
+    assert password_needs_rehash(legacy_hash("s3cret"))
+    assert not password_needs_rehash(hash_password("s3cret"))
+    # Hashes made with weaker parameters are upgraded too
+    assert password_needs_rehash(PasswordHasher(time_cost=1, memory_cost=8192).hash("s3cret"))
+
+
+def test_verify_many_mixes_legacy_and_argon2_hashes():
+    passwords = ["a", "b", "c", "d"]
+    hashed = [legacy_hash("a"), hash_password("b"), legacy_hash("x"), hash_password("x")]
+    assert verify_many(passwords, hashed).tolist() == [True, True, False, False]
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_sha256_many_matches_hashlib(monkeypatch, workers):
+    # Force the threaded path for a small batch
+    monkeypatch.setattr(security, "_HASH_WORKERS", workers)
+    monkeypatch.setattr(security, "_PARALLEL_HASH_MIN_BYTES", 1)
+    items = [bytes([i]) * i for i in range(10)]
+    assert sha256_many(iter(items)) == [hashlib.sha256(item).digest() for item in items]
+    assert sha256_many([]) == []
+
+
+def test_generate_secure_token():
+    tokens = {generate_secure_token() for _ in range(50)}
+    assert len(tokens) == 50
+    assert all(len(token) == 32 and token.isalnum() for token in tokens)
+    assert len(generate_secure_token(100)) == 100
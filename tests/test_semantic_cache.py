@@ -0,0 +1,100 @@
+"""Tests for the semantic response cache."""
+
+import streamlit as st
+
+import src.vector_store.milvus as milvus_module
+from src.utils.config import Config
+from src.vector_store.milvus import SemanticCache, clear_semantic_cache, get_semantic_cache
+
+
+def _cache(capacity: int = 4, ttl_seconds: float = 60) -> SemanticCache:
+    return SemanticCache(dim=3, capacity=capacity, threshold=0.92, ttl_seconds=ttl_seconds)
+
+
+def test_lookup_returns_most_similar_response():
+    cache = _cache()
+    assert cache.lookup([1, 0, 0]) is None
+    
+    cache.add([1, 0, 0], "x")
+    cache.add([0, 1, 0], "y")
+    assert cache.lookup([2, 0.1, 0]) == "x"
+    assert cache.lookup([0, 1, 0.05]) == "y"
+
+
+def test_lookup_below_threshold_misses():
+    cache = _cache()
+    cache.add([1, 0, 0], "x")
+    
+    # Cosine similarity of about 0.71
+    assert cache.lookup([1, 1, 0]) is None
+    # A zero vector has no direction to compare
+    assert cache.lookup([0, 0, 0]) is None
+
+
+def test_expired_responses_are_not_returned(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(milvus_module.time, "time", lambda: now[0])
+    cache = _cache(ttl_seconds=10)
+    cache.add([1, 0, 0], "x")
+    
+    now[0] += 9
+    assert cache.lookup([1, 0, 0]) == "x"
+    now[0] += 2
+    assert cache.lookup([1, 0, 0]) is None
+
+
+def test_full_cache_replaces_oldest_entry():
+    cache = _cache(capacity=2)
+    cache.add([1, 0, 0], "x")
+    cache.add([0, 1, 0], "y")
+    cache.add([0, 0, 1], "z")
+    
+    assert cache.lookup([1, 0, 0]) is None
+    assert cache.lookup([0, 1, 0]) == "y"
+    assert cache.lookup([0, 0, 1]) == "z"
+
+
+def test_zero_capacity_disables_cache():
+    cache = _cache(capacity=0)
+    cache.add([1, 0, 0], "x")
+    assert cache.lookup([1, 0, 0]) is None
+
+
+def test_clear_removes_all_responses():
+    cache = _cache()
+    cache.add([1, 0, 0], "x")
+    cache.clear()
+    assert cache.lookup([1, 0, 0]) is None
+    
+    cache.add([0, 1, 0], "y")
+    assert cache.lookup([0, 1, 0]) == "y"
+
+
+def test_session_cache_is_scoped_to_query_engine():
+    first_engine, second_engine = object(), object()
+    cache = get_semantic_cache(first_engine)
+    assert get_semantic_cache(first_engine) is cache
+    
+    cache.add([1.0] * Config.EMBEDDING_DIMENSION, "x")
+    other = get_semantic_cache(second_engine)
+    assert other is not cache
+    assert other.lookup([1.0] * Config.EMBEDDING_DIMENSION) is None
+
+
+def test_clear_semantic_cache_starts_a_new_cache():
+    engine = object()
+    cache = get_semantic_cache(engine)
+    clear_semantic_cache()
+    assert get_semantic_cache(engine) is not cache
+
+
+def test_clear_semantic_cache_invalidates_other_sessions():
+    engine = object()
+    cache = get_semantic_cache(engine)
+    other_session = st.session_state._semantic_cache
+    
+    # Another session indexes documents, then this session is served again
+    st.session_state.clear()
+    clear_semantic_cache()
+    st.session_state._semantic_cache = other_session
+    assert get_semantic_cache(engine) is not cache
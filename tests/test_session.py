@@ -0,0 +1,110 @@
+"""Tests for session validation and renewal."""
+
+from datetime import datetime, timedelta
+
+import pytest
+import streamlit as st
+
+from src.auth.session import SessionManager
+from src.database.sqlite import SQLiteDatabase
+from src.utils.config import Config
+
+
+class CountingDatabase:
+    """Records session storage calls; any session lookup is a miss."""
+    
+    def __init__(self):
+        self.calls = []
+    
+    def update_session_expiry(self, session_id, expires_at):
+        self.calls.append(("update", session_id))
+        return True
+    
+    def get_session(self, session_id):
+        self.calls.append(("get", session_id))
+        return None
+    
+    def delete_session(self, session_id):
+        self.calls.append(("delete", session_id))
+        return True
+
+
+@pytest.fixture
+def db():
+    database = SQLiteDatabase(":memory:")
+    assert database.initialize()
+    yield database
+    database.close()
+
+
+def _window() -> timedelta:
+    return timedelta(minutes=Config.SESSION_EXPIRY_MINUTES)
+
+
+def test_fresh_session_is_valid_without_touching_storage():
+    database = CountingDatabase()
+    st.session_state.session_id = "s1"
+    expiry = datetime.now() + _window()
+    st.session_state.session_expiry = expiry
+    
+    assert SessionManager(database).validate_session("s1")
+    assert database.calls == []
+    assert st.session_state.session_expiry == expiry
+
+
+def test_session_past_half_its_window_is_renewed():
+    database = CountingDatabase()
+    st.session_state.session_id = "s1"
+    st.session_state.session_expiry = datetime.now() + _window() / 4
+    
+    assert SessionManager(database).validate_session("s1")
+    assert database.calls == [("update", "s1")]
+    assert st.session_state.session_expiry > datetime.now() + _window() * 0.9
+
+
+def test_expired_session_state_is_rejected_and_deleted():
+    database = CountingDatabase()
+    st.session_state.session_id = "s1"
+    st.session_state.session_expiry = datetime.now() - timedelta(seconds=1)
+    
+    assert not SessionManager(database).validate_session("s1")
+    assert database.calls == [("delete", "s1")]
+
+
+def test_unknown_and_empty_sessions_are_rejected():
+    database = CountingDatabase()
+    manager = SessionManager(database)
+    assert not manager.validate_session("")
+    assert not manager.validate_session("missing")
+    assert database.calls == [("get", "missing")]
+
+
+def test_stored_session_is_validated_and_extended(db):
+    manager = SessionManager(db)
+    session = manager.create_session("alice")
+    
+    # A new browser session only has the stored session to go on
+    st.session_state.clear()
+    assert manager.validate_session(session.session_id)
+    assert st.session_state.session_expiry > datetime.now() + _window() * 0.9
+    
+    db.update_session_expiry(session.session_id, datetime.now() - timedelta(seconds=1))
+    st.session_state.clear()
+    assert not manager.validate_session(session.session_id)
+    assert db.get_session(session.session_id) is None
+
+
+def test_file_sessions_are_validated_and_extended(tmp_path, monkeypatch):
+    monkeypatch.setattr(Config, "SESSIONS_JSON_PATH", str(tmp_path / "sessions.json"))
+    manager = SessionManager()
+    session = manager.create_session("alice")
+    
+    st.session_state.clear()
+    assert manager.validate_session(session.session_id)
+    
+    sessions = manager._load_sessions()
+    sessions[session.session_id]["expires_at"] = int((datetime.now() - timedelta(seconds=1)).timestamp())
+    manager._save_sessions(sessions)
+    st.session_state.clear()
+    assert not manager.validate_session(session.session_id)
+    assert session.session_id not in manager._load_sessions()
@@ -0,0 +1,189 @@
+"""Tests for the SQLite database backend."""
+
+import sqlite3
+import time
+
+import pytest
+
+from src.database.sqlite import SCHEMA_VERSION, SQLiteConnectionPool, SQLiteDatabase, _is_in_memory
+
+
+@pytest.mark.parametrize("db_path, expected", [
+    (":memory:", True),
+    ("", True),
+    ("file::memory:", True),
+    ("file:cache?mode=memory&cache=shared", True),
+    ("file:db/qnachat.db", False),
+    ("db/qnachat.db", False),
+    ("db/memory.db", False),
+])
+def test_is_in_memory(db_path, expected):
+    assert _is_in_memory(db_path) is expected
+
+
+@pytest.mark.parametrize("db_path", [":memory:", "file::memory:"])
+def test_in_memory_database_shares_one_connection(db_path):
+    db = SQLiteDatabase(db_path)
+    assert db.initialize()
+    try:
+        # initialize and the pool agree, so the schema is on the one connection
+        assert db.pool.size == 1
+        assert db._writer is None
+        
+        assert db.store_user("alice", "hash", is_admin=True)
+        assert db.get_user("alice")["is_admin"] is True
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def file_db(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "qnachat.db"))
+    assert db.initialize()
+    yield db
+    db.close()
+
+
+def test_pool_opens_connections_lazily_up_to_size(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), size=2, timeout=0.05)
+    try:
+        assert pool._created == 0
+        with pool.acquire() as first:
+            with pool.acquire() as second:
+                assert first is not second
+                assert pool._created == 2
+                # A third borrower waits for a free connection, then gives up
+                with pytest.raises(sqlite3.OperationalError, match="Timed out"):
+                    with pool.acquire():
+                        pass
+        
+        # Released connections are reused, most recently returned first
+        with pool.acquire() as conn:
+            assert conn is first
+        assert pool._created == 2
+    finally:
+        pool.close()
+    assert pool._created == 0
+
+
+def test_pool_recycles_old_connections(tmp_path, monkeypatch):
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), size=1, recycle=10)
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    try:
+        with pool.acquire() as first:
+            pass
+        with pool.acquire() as conn:
+            assert conn is first
+            now[0] += 11
+        assert pool._created == 0
+        with pool.acquire() as conn:
+            assert conn is not first
+    finally:
+        pool.close()
+
+
+def test_pool_rolls_back_open_transactions_on_release(tmp_path):
+    pool = SQLiteConnectionPool(str(tmp_path / "pool.db"), size=1)
+    try:
+        with pool.acquire() as conn:
+            conn.execute("CREATE TABLE t (x INTEGER)")
+            conn.execute("BEGIN")
+            conn.execute("INSERT INTO t VALUES (1)")
+        with pool.acquire() as conn:
+            assert not conn.in_transaction
+            assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    finally:
+        pool.close()
+
+
+def test_read_only_pool_rejects_writes(file_db):
+    with file_db.pool.acquire() as conn:
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("DELETE FROM users")
+
+
+def test_initialize_enables_wal_and_schema_version(file_db):
+    with file_db.pool.acquire() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+
+
+def test_transaction_commits_or_rolls_back_together(file_db):
+    with file_db.transaction():
+        file_db.store_user("alice", "hash")
+        file_db.log_activity("alice", "login")
+    assert file_db.get_user("alice") is not None
+    assert len(file_db.get_activity_logs()) == 1
+    
+    with pytest.raises(RuntimeError):
+        with file_db.transaction():
+            file_db.log_activity("alice", "query")
+            raise RuntimeError("abort")
+    assert len(file_db.get_activity_logs()) == 1
+
+
+V1_SCHEMA = """
+CREATE TABLE users (username TEXT PRIMARY KEY, password_hash TEXT NOT NULL, is_admin BOOLEAN NOT NULL,
+                    created_at TEXT NOT NULL, last_login TEXT);
+CREATE TABLE sessions (session_id TEXT PRIMARY KEY, username TEXT NOT NULL, created_at TEXT NOT NULL,
+                       expires_at INTEGER NOT NULL);
+CREATE TABLE activity_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT NOT NULL,
+                            username TEXT NOT NULL, activity TEXT NOT NULL, details TEXT);
+CREATE INDEX idx_logs_ts ON activity_logs(timestamp);
+CREATE TABLE chat_history (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL, session_id TEXT NOT NULL,
+                           message TEXT NOT NULL, response TEXT NOT NULL, timestamp TEXT NOT NULL);
+CREATE TABLE documents (id INTEGER PRIMARY KEY AUTOINCREMENT, username TEXT NOT NULL, filename TEXT NOT NULL,
+                        file_path TEXT NOT NULL, upload_timestamp TEXT NOT NULL, file_size INTEGER NOT NULL,
+                        file_type TEXT NOT NULL);
+INSERT INTO users VALUES ('alice', 'hash', 1, '2024-01-02T03:04:05', NULL);
+INSERT INTO sessions VALUES ('s1', 'alice', '2024-01-02T03:04:05', 0);
+INSERT INTO activity_logs (timestamp, username, activity, details) VALUES ('2024-01-02T03:04:05', 'alice', 'login', NULL);
+INSERT INTO activity_logs (timestamp, username, activity, details) VALUES ('2024-01-03T03:04:05', 'alice', 'query', 'q');
+INSERT INTO chat_history (username, session_id, message, response, timestamp) VALUES ('alice', 's1', 'hi', 'hello', '2024-01-02T03:04:06');
+INSERT INTO documents (username, filename, file_path, upload_timestamp, file_size, file_type)
+    VALUES ('alice', 'a.pdf', 'uploads/a.pdf', '2024-01-02T03:04:07', 10, 'pdf');
+PRAGMA user_version = 1;
+"""
+
+
+def test_migrates_v1_text_timestamps(tmp_path):
+    db_path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(db_path)
+    conn.executescript(V1_SCHEMA)
+    conn.close()
+    
+    db = SQLiteDatabase(db_path)
+    assert db.initialize()
+    try:
+        user = db.get_user("alice")
+        assert user["created_at"] == "2024-01-02T03:04:05"
+        assert user["is_admin"] is True
+        
+        logs = db.get_activity_logs()
+        assert [(log["timestamp"], log["activity"]) for log in logs] == [
+            ("2024-01-03T03:04:05", "query"),
+            ("2024-01-02T03:04:05", "login"),
+        ]
+        assert db.get_chat_history("alice") == [("hi", "hello")]
+        assert db.get_user_documents("alice")[0]["upload_timestamp"] == "2024-01-02T03:04:07"
+        # Sessions are short-lived and are dropped instead of converted
+        assert db.get_session("s1") is None
+        
+        with db.pool.acquire() as conn:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+            assert conn.execute("SELECT typeof(created_at) FROM users").fetchone()[0] == "integer"
+            tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            assert not any(table.endswith("_v1") for table in tables)
+            indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            assert {"idx_logs_ts", "idx_chat_user_ts", "idx_docs_user_ts"} <= indexes
+    finally:
+        db.close()
+    
+    # A second initialize finds the current version and changes nothing
+    db = SQLiteDatabase(db_path)
+    assert db.initialize()
+    try:
+        assert len(db.get_activity_logs()) == 2
+    finally:
+        db.close()
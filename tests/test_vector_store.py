@@ -0,0 +1,74 @@
+"""Tests for the shared Milvus vector store helpers."""
+
+import types
+
+import streamlit as st
+from llama_index.core import Document, MockEmbedding, Settings
+from llama_index.core.llms import MockLLM
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import NodeRelationship, RelatedNodeInfo, TextNode
+from llama_index.vector_stores.milvus import MilvusVectorStore
+
+import src.document_processing.indexer as indexer_module
+import src.vector_store.milvus as milvus_module
+from src.document_processing.indexer import DocumentIndexer, current_vector_index
+from src.vector_store.milvus import indexed_doc_ids
+
+
+def _node(doc_id: str, text: str) -> TextNode:
+    node = TextNode(text=text, embedding=[0.1, 0.2, 0.3, 0.4])
+    node.relationships[NodeRelationship.SOURCE] = RelatedNodeInfo(node_id=doc_id)
+    return node
+
+
+def test_indexed_doc_ids_finds_stored_documents(tmp_path, monkeypatch):
+    vector_store = MilvusVectorStore(uri=str(tmp_path / "milvus.db"), dim=4, overwrite=False)
+    vector_store.add([_node("aa", "first"), _node("bb", "second"), _node("aa", "third")])
+    
+    assert indexed_doc_ids(vector_store, ["aa", "cc", "bb"]) == {"aa", "bb"}
+    assert indexed_doc_ids(vector_store, []) == set()
+    
+    # Ids spanning several queries are all found
+    monkeypatch.setattr(milvus_module, "_DOC_ID_QUERY_BATCH", 1)
+    assert indexed_doc_ids(vector_store, ["aa", "cc", "bb"]) == {"aa", "bb"}
+
+
+def test_current_vector_index_drops_index_of_rebuilt_store(monkeypatch):
+    store = object()
+    monkeypatch.setattr(indexer_module, "get_vector_store", lambda: store)
+    index = types.SimpleNamespace(vector_store=store)
+    st.session_state.vector_index = index
+    st.session_state.documents_loaded = True
+    assert current_vector_index() is index
+    
+    # The collection was rebuilt, so the shared store is a new instance
+    monkeypatch.setattr(indexer_module, "get_vector_store", lambda: object())
+    assert current_vector_index() is None
+    assert st.session_state.vector_index is None
+    assert st.session_state.query_engine is None
+    assert st.session_state.documents_loaded is False
+
+
+def test_users_only_retrieve_their_own_documents(tmp_path, monkeypatch):
+    monkeypatch.setattr(Settings, "_embed_model", MockEmbedding(embed_dim=4))
+    monkeypatch.setattr(Settings, "_llm", MockLLM())
+    monkeypatch.setattr(Settings, "_node_parser", SentenceSplitter())
+    vector_store = MilvusVectorStore(uri=str(tmp_path / "milvus.db"), dim=4, overwrite=False)
+    monkeypatch.setattr(indexer_module, "get_vector_store", lambda: vector_store)
+    indexer = DocumentIndexer(vector_store)
+    
+    index = indexer.build_index([Document(text="shared text"), Document(text="alice only")], username="alice")
+    st.session_state.vector_index = index
+    # The same text uploaded by another user is stored again, under its owner
+    index = indexer.build_index([Document(text="shared text")], username="bob")
+    
+    retriever = indexer.get_query_engine(index, similarity_top_k=10, streaming=False, username="bob").retriever
+    nodes = retriever.retrieve("text")
+    assert [node.text for node in nodes] == ["shared text"]
+    assert nodes[0].metadata["username"] == "bob"
+    
+    retriever = indexer.get_query_engine(index, similarity_top_k=10, streaming=False, username="alice").retriever
+    assert sorted(node.text for node in retriever.retrieve("text")) == ["alice only", "shared text"]
+    
+    # Re-uploading adds nothing new
+    assert indexer.build_index([Document(text="alice only")], username="alice") is index